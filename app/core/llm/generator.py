@@ -6,9 +6,11 @@ Generates formal safety incident reports using Large Language Models.
 import os
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from io import BytesIO
+from typing import BinaryIO, Dict, List, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
 
 from loguru import logger
 import openai
@@ -62,6 +64,19 @@ class IncidentReport:
     format: ReportFormat
     generated_at: datetime
     
+    @cached_property
+    def dict_repr(self) -> Dict:
+        """
+        Dictionary form of the report, computed once per instance.
+
+        Call invalidate_dict_repr() after mutating the report or its metadata.
+        """
+        return self.to_dict()
+    
+    def invalidate_dict_repr(self) -> None:
+        """Drop the cached dict_repr so it is rebuilt on next access."""
+        self.__dict__.pop('dict_repr', None)
+    
     def to_dict(self) -> Dict:
         """Convert report to dictionary."""
         return {
@@ -561,17 +576,35 @@ Status: COMPLIANT
         Returns:
             bytes: PDF content as bytes
         """
+        return self.generate_pdf_stream(report).getvalue()
+
+    def generate_pdf_stream(
+        self,
+        report: IncidentReport,
+        buffer: Optional[BinaryIO] = None
+    ) -> BinaryIO:
+        """
+        Write professional OSHA-compliant PDF report into a binary stream.
+
+        Args:
+            report: IncidentReport object
+            buffer: Stream to write into (a new BytesIO if not given)
+
+        Returns:
+            The stream, positioned at the start of the PDF
+        """
         from reportlab.lib import colors
         from reportlab.lib.pagesizes import letter, A4
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.units import inch
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
         from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-        from io import BytesIO
         import os
 
         # Create PDF buffer
-        buffer = BytesIO()
+        if buffer is None:
+            buffer = BytesIO()
+        start = buffer.tell()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
         styles = getSampleStyleSheet()
 
@@ -730,8 +763,8 @@ Status: COMPLIANT
 
         # Build PDF
         doc.build(content)
-        buffer.seek(0)
-        return buffer.getvalue()
+        buffer.seek(start)
+        return buffer
 
 
 def create_report_generator(config: Optional[Dict] = None) -> ReportGenerator:
@@ -4,6 +4,9 @@ Supports RTSP streaming and ONVIF camera discovery for IP cameras.
 """
 
 import cv2
+import contextlib
+import ipaddress
+import os
 import requests
 import socket
 import threading
@@ -15,6 +18,47 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# FFmpeg options for RTSP captures: TCP transport skips UDP setup probing (and
+# works with TCP-only cameras); a small buffer with no demuxer delay keeps open
+# and read latency low. A user-set OPENCV_FFMPEG_CAPTURE_OPTIONS takes precedence.
+RTSP_CAPTURE_OPTIONS = 'rtsp_transport;tcp|buffer_size;65536|max_delay;500000|fflags;nobuffer'
+
+# OpenCV reads the options from the environment at open time, so they are set
+# only while RTSP captures are being opened. RTSP opens may overlap each other;
+# other FFmpeg opens wait until none is in progress.
+_capture_options = threading.Condition()
+_rtsp_opens = 0
+_user_options = None
+
+
+@contextlib.contextmanager
+def rtsp_capture_options():
+    """Apply RTSP_CAPTURE_OPTIONS to FFmpeg captures opened inside the block."""
+    global _rtsp_opens, _user_options
+    with _capture_options:
+        if _rtsp_opens == 0:
+            _user_options = os.environ.get('OPENCV_FFMPEG_CAPTURE_OPTIONS')
+            if _user_options is None:
+                os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = RTSP_CAPTURE_OPTIONS
+        _rtsp_opens += 1
+    try:
+        yield
+    finally:
+        with _capture_options:
+            _rtsp_opens -= 1
+            if _rtsp_opens == 0:
+                if _user_options is None:
+                    os.environ.pop('OPENCV_FFMPEG_CAPTURE_OPTIONS', None)
+                _capture_options.notify_all()
+
+
+@contextlib.contextmanager
+def default_capture_options():
+    """Keep RTSP_CAPTURE_OPTIONS away from FFmpeg captures opened inside the block."""
+    with _capture_options:
+        _capture_options.wait_for(lambda: _rtsp_opens == 0)
+        yield
+
 
 class RTSPCamera:
     """RTSP Camera class for handling RTSP streams."""
@@ -38,9 +82,12 @@ class RTSPCamera:
             else:
                 self.auth_url = self.url
 
-            self.cap = cv2.VideoCapture(self.auth_url, cv2.CAP_FFMPEG)
+            with rtsp_capture_options():
+                self.cap = cv2.VideoCapture(self.auth_url, cv2.CAP_FFMPEG)
             # Check if cap is actually a VideoCapture object (not a boolean)
             if self.cap is not None and hasattr(self.cap, 'isOpened') and self.cap.isOpened():
+                # Keep only the newest frame queued
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                 self.is_connected = True
                 logger.info(f"✅ Connected to RTSP stream: {self.url}")
                 return True
@@ -95,21 +142,12 @@ class ONVIFDiscovery:
         self.discovered_cameras = []
 
         try:
-            # Parse network range
-            base_ip, subnet = network_range.split('/')
-            subnet = int(subnet)
-
-            # Calculate network range
-            ip_parts = base_ip.split('.')
-            base = (int(ip_parts[0]) << 24) | (int(ip_parts[1]) << 16) | (int(ip_parts[2]) << 8) | int(ip_parts[3])
-            mask = (0xFFFFFFFF << (32 - subnet)) & 0xFFFFFFFF
-            network = base & mask
-            broadcast = network | (~mask & 0xFFFFFFFF)
+            # Hosts in the range (network and broadcast addresses excluded)
+            hosts = [str(ip) for ip in ipaddress.ip_network(network_range, strict=False).hosts()]
 
             # Scan IP range
             threads = []
-            for ip_int in range(network + 1, broadcast):
-                ip = f"{(ip_int >> 24) & 0xFF}.{(ip_int >> 16) & 0xFF}.{(ip_int >> 8) & 0xFF}.{ip_int & 0xFF}"
+            for ip in hosts:
                 thread = threading.Thread(target=self._check_onvif_device, args=(ip,))
                 threads.append(thread)
                 thread.start()
@@ -3,20 +3,46 @@ SiteGuard AI - Enhanced Streamlit Web Application
 Interactive dashboard for PPE detection with Live Webcam, Analytics, and Dark Mode
 """
 
+import atexit
+import os
 import sys
 from pathlib import Path
 import streamlit as st
 import cv2
 import numpy as np
-from PIL import Image
+import pandas as pd
 from datetime import datetime, timedelta
 import json
+import gzip
 import io
+import itertools
+import shutil
 import time
-from collections import defaultdict
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict, List
+import traceback
+import zipfile
+from collections import Counter, deque
+from fractions import Fraction
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List
+from packaging.version import Version
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -26,17 +52,20 @@ print("🔍 Starting SiteGuard AI application...")
 print(f"Python version: {sys.version}")
 print(f"Current working directory: {Path.cwd()}")
 
-from app.core.vision.detector import PPEDetector, create_detector
 from app.core.llm.generator import ReportGenerator, ReportMetadata, ReportFormat, create_report_generator
 from app.core.notification import create_telegram_notifier
-from app.core.vision.rtsp_onvif import RTSPCamera, ONVIFDiscovery
 from utils.config import load_config
 from loguru import logger
 
+# plotly and the vision stack (torch/ultralytics) are imported where first
+# used, so a cold start doesn't pay for them before they are needed
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from app.core.vision.detector import PPEDetector
+
 # Environment detection
 def is_cloud_environment():
     """Detect if running in a cloud environment (Streamlit Cloud, etc.)"""
-    import os
     # Check for Streamlit Cloud environment variables
     cloud_indicators = [
         'STREAMLIT_SERVER_HEADLESS',  # Streamlit Cloud
@@ -62,26 +91,181 @@ def is_cloud_environment():
 
 print("✅ Imports completed successfully")
 
+# st.download_button accepts a zero-arg callable for `data` from 1.52 onwards
+DEFERRED_DOWNLOADS = Version(st.__version__) >= Version("1.52")
+
+# Downloads don't need a script rerun; on_click="ignore" exists from 1.42 onwards
+_DL_KWARGS = {"on_click": "ignore"} if Version(st.__version__) >= Version("1.42") else {}
+
+
+def download_data(producer):
+    """
+    Prepare a download payload, deferring the work to click time when supported.
+
+    Args:
+        producer: Zero-arg callable returning the payload
+
+    Returns:
+        The callable itself, or its result on older Streamlit versions
+    """
+    return producer if DEFERRED_DOWNLOADS else producer()
+
+
+# Export payload caches are keyed only on the report (id + contents), never on
+# session or theme state, so toggling dark mode reuses the cached payloads.
+@st.cache_data(show_spinner=False, max_entries=32)
+def _pdf_stream(report_id: str, report_dict: Dict, _generator, _report) -> io.BytesIO:
+    """Render the OSHA PDF once per report contents (generator/report are not hashed)."""
+    return _generator.generate_pdf_stream(_report)
+
+
+def _json_payload(report_dict: Dict) -> bytes:
+    """Encode the report dictionary as compact JSON (shared by every JSON export)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(report_dict, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(report_dict, separators=(',', ':')).encode('utf-8')
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _json_bytes(report_id: str, report_dict: Dict) -> bytes:
+    """Serialize the report dictionary once per report contents as gzipped compact JSON."""
+    return gzip.compress(_json_payload(report_dict), compresslevel=1)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _txt_bytes(report_id: str, report_dict: Dict) -> bytes:
+    """Encode the plain-text report once per report contents."""
+    return report_dict['text'].encode('utf-8')
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _bundle(report_id: str, report_dict: Dict, _generator, _report) -> bytes:
+    """Pack the PDF, JSON and text exports of a report into a single zip archive."""
+    names = _export_file_names(report_id, report_dict['metadata']['ref_no'])
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        archive.writestr(names["PDF"], _pdf_stream(report_id, report_dict, _generator, _report).getvalue())
+        archive.writestr(f"{report_id}.json", _json_payload(report_dict))
+        archive.writestr(names["TXT"], _txt_bytes(report_id, report_dict))
+    return buffer.getvalue()
+
 
 # Working ONVIF Discovery Implementation
-from onvif import ONVIFCamera
-from zeep.exceptions import Fault
 import socket
 import threading
+import queue
 import time
 import uuid
 import re
+import asyncio
+import selectors
 import concurrent.futures
 from typing import List, Dict, Optional
 
+# RTSP URL parts: embedded credentials, path after host[:port], and port
+_CRED_RE = re.compile(r'rtsp://[^@]+@')
+_PATH_RE = re.compile(r'rtsp://[^/]+/(.+)')
+_PORT_RE = re.compile(r':(\d+)/')
+
+
+@lru_cache(maxsize=None)
+def _probe_match_xpath():
+    """
+    lxml parser and compiled XAddrs XPath for WS-Discovery probe matches
+
+    Probe replies are untrusted network input, so the parser neither expands
+    entities nor touches the network.
+    """
+    from lxml import etree
+
+    parser = etree.XMLParser(resolve_entities=False, no_network=True)
+    xaddrs_xpath = etree.XPath(
+        '//d:XAddrs/text()',
+        namespaces={'d': 'http://schemas.xmlsoap.org/ws/2005/04/discovery'}
+    )
+    return parser, xaddrs_xpath
+
+
+@lru_cache(maxsize=None)
+def _soap_transport():
+    """
+    zeep transport with one keep-alive HTTP pool shared by every camera
+
+    Successive ONVIF calls reuse pooled connections instead of opening a
+    new TCP connection per SOAP request.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from zeep.transports import Transport
+
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+    session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+    return Transport(session=session)
+
+
+@lru_cache(maxsize=64)
+def _open_onvif_camera(ip, port, user, password):
+    """
+    Connect to an ONVIF camera, caching the client per camera and credentials
+
+    Building an ONVIFCamera parses the WSDL files and creates zeep clients,
+    so repeat queries of the same camera reuse the cached object together
+    with its device and media services.
+
+    Returns:
+        ONVIFCamera with `device_service` and `media_service` attributes
+    """
+    # onvif/zeep pull in lxml and the WSDL machinery; only load them
+    # when a camera is actually queried
+    import onvif
+    from onvif import ONVIFCamera
+
+    wsdl_dir = os.path.join(os.path.dirname(onvif.__file__), 'wsdl')
+
+    print(f"[ONVIF] Connecting to {ip}:{port} with user '{user}'")
+
+    # Create ONVIF camera connection with WSDL files
+    if os.path.exists(wsdl_dir):
+        print(f"[ONVIF] Using WSDL directory: {wsdl_dir}")
+        camera = ONVIFCamera(ip, port, user, password, wsdl_dir=wsdl_dir, transport=_soap_transport())
+    else:
+        print(f"[ONVIF] WSDL not found, trying without WSDL")
+        camera = ONVIFCamera(ip, port, user, password, transport=_soap_transport())
+
+    camera.device_service = camera.create_devicemgmt_service()
+    camera.media_service = camera.create_media_service()
+    return camera
+
+
 class WorkingONVIFDiscovery:
     """ONVIF camera discovery and management with WS-Discovery"""
 
     COMMON_ONVIF_PORTS = [2020, 80, 8080, 8000, 8899, 10080]
+    # Upper bound on sockets open at once during a port scan
+    MAX_CONCURRENT_SOCKETS = 512
+    # Once a camera has answered, keep listening this long for slower ones (seconds)
+    MIN_PROBE_WINDOW = 0.5
+    # WS-Discovery Types to probe for (namespace, type); devices only answer
+    # probes whose Types they match
+    PROBE_TYPES = (
+        ('http://www.onvif.org/ver10/network/wsdl', 'NetworkVideoTransmitter'),
+        ('http://www.onvif.org/ver10/device/wsdl', 'Device'),
+        ('http://www.onvif.org/ver10/network/wsdl', 'NetworkVideoDisplay'),
+    )
 
     def __init__(self):
-        self.discovered_cameras = []
+        # Discovered cameras keyed by IP, in discovery order
+        self._cam_by_ip: Dict[str, Dict] = {}
         self.discovery_lock = threading.Lock()
+        # Set when WS-Discovery finds the first camera
+        self._found_event = threading.Event()
+
+    @property
+    def discovered_cameras(self) -> List[Dict]:
+        """Cameras found by the current or last discovery run"""
+        with self.discovery_lock:
+            return list(self._cam_by_ip.values())
 
     def discover_cameras(self, timeout=5):
         """
@@ -95,7 +279,9 @@ class WorkingONVIFDiscovery:
         """
         print(f"[*] Starting ONVIF camera discovery (timeout: {timeout}s)...")
 
-        self.discovered_cameras = []
+        with self.discovery_lock:
+            self._cam_by_ip = {}
+        self._found_event.clear()
 
         # Try WS-Discovery first
         discovery_thread = threading.Thread(
@@ -107,21 +293,21 @@ class WorkingONVIFDiscovery:
         discovery_thread.join(timeout + 1)
 
         # If WS-Discovery failed, use network scan
-        if len(self.discovered_cameras) == 0:
+        if not self._cam_by_ip:
             print("[*] WS-Discovery failed, attempting network scan...")
             scanned_cameras = self._scan_local_network()
             with self.discovery_lock:
-                self.discovered_cameras.extend(scanned_cameras)
+                for cam in scanned_cameras:
+                    self._cam_by_ip.setdefault(cam['ip'], cam)
 
-        print(f"[+] Found {len(self.discovered_cameras)} camera(s)")
-        return self.discovered_cameras
+        cameras = self.discovered_cameras
+        print(f"[+] Found {len(cameras)} camera(s)")
+        return cameras
 
     def _ws_discovery(self, timeout):
         """Perform WS-Discovery on local network"""
-        import xml.etree.ElementTree as ET
-
-        # WS-Discovery probe message
-        probe_msg = (
+        # WS-Discovery probe messages, one per probe type, each with its own MessageID
+        probe_msgs = [(
             '<?xml version="1.0" encoding="UTF-8"?>'
             '<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" '
             'xmlns:a="http://schemas.xmlsoap.org/ws/2004/08/addressing">'
@@ -133,80 +319,131 @@ class WorkingONVIFDiscovery:
             '<s:Body>'
             '<Probe xmlns="http://schemas.xmlsoap.org/ws/2005/04/discovery">'
             '<d:Types xmlns:d="http://schemas.xmlsoap.org/ws/2005/04/discovery" '
-            'xmlns:dp0="http://www.onvif.org/ver10/network/wsdl">dp0:NetworkVideoTransmitter</d:Types>'
+            'xmlns:dp0="' + namespace + '">dp0:' + probe_type + '</d:Types>'
             '</Probe>'
             '</s:Body>'
             '</s:Envelope>'
-        ).encode('utf-8')
-
-        # Create UDP socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        sock.settimeout(timeout)
+        ).encode('utf-8') for namespace, probe_type in self.PROBE_TYPES]
 
         # Multicast address for WS-Discovery
         multicast_addr = ('239.255.255.250', 3702)
 
-        try:
-            # Send probe
-            sock.sendto(probe_msg, multicast_addr)
-
-            # Also try broadcast
+        # One UDP socket per interface: on multi-homed hosts (docker, VPN,
+        # several NICs) the OS would send a single probe out of one NIC only
+        sockets = []
+        for local_ip in self._local_ipv4_addresses():
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             try:
-                sock.sendto(probe_msg, ('255.255.255.255', 3702))
-            except:
-                pass
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(local_ip))
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+                sock.bind((local_ip, 0))
+                sock.setblocking(False)
+            except OSError:
+                sock.close()
+                continue
+            sockets.append(sock)
 
-            # Receive responses
-            start_time = time.time()
-            while time.time() - start_time < timeout:
+        selector = selectors.DefaultSelector()
+        try:
+            for sock in sockets:
+                # Send all probe types back-to-back; replies are deduplicated by IP
                 try:
-                    data, addr = sock.recvfrom(65536)
-                    self._parse_probe_match(data, addr[0])
-                except socket.timeout:
-                    break
-                except Exception as e:
+                    for probe_msg in probe_msgs:
+                        sock.sendto(probe_msg, multicast_addr)
+                except OSError:
+                    continue
+
+                # Also try broadcast
+                try:
+                    for probe_msg in probe_msgs:
+                        sock.sendto(probe_msg, ('255.255.255.255', 3702))
+                except OSError:
                     pass
 
+                selector.register(sock, selectors.EVENT_READ)
+
+            # Receive responses from every interface in one loop
+            start = time.monotonic()
+            deadline = start + timeout
+            while selector.get_map():
+                # Stop early once a camera has answered and the minimum
+                # window for slower cameras has passed
+                if self._found_event.is_set():
+                    deadline = min(deadline, start + self.MIN_PROBE_WINDOW)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    try:
+                        data, addr = key.fileobj.recvfrom(65536)
+                    except OSError:
+                        continue
+                    self._parse_probe_match(data, addr[0])
+
         finally:
-            sock.close()
+            selector.close()
+            for sock in sockets:
+                sock.close()
+
+    @staticmethod
+    def _local_ipv4_addresses() -> List[str]:
+        """IPv4 addresses of the local non-loopback interfaces to probe from"""
+        if PSUTIL_AVAILABLE:
+            addresses = [
+                addr.address
+                for addrs in psutil.net_if_addrs().values()
+                for addr in addrs
+                if addr.family == socket.AF_INET and not addr.address.startswith('127.')
+            ]
+            if addresses:
+                return addresses
+
+        # Fall back to the interface holding the default route
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("8.8.8.8", 80))
+                return [s.getsockname()[0]]
+        except OSError:
+            return ['0.0.0.0']
 
     def _parse_probe_match(self, data, ip):
         """Parse WS-Discovery probe match response"""
+        # Skip replies without XAddrs (e.g. other hosts' probes) before parsing
+        if b'XAddrs' not in data:
+            return
+
         try:
-            import xml.etree.ElementTree as ET
+            parser, xaddrs_xpath = _probe_match_xpath()
+            from lxml import etree
 
-            root = ET.fromstring(data.decode('utf-8'))
+            root = etree.fromstring(data, parser)
 
             # Extract XAddrs (camera URLs)
-            namespaces = {
-                'soap': 'http://www.w3.org/2003/05/soap-envelope',
-                'd': 'http://schemas.xmlsoap.org/ws/2005/04/discovery'
-            }
-
-            xaddrs = root.find('.//d:XAddrs', namespaces)
-            if xaddrs is not None and xaddrs.text:
-                urls = xaddrs.text.split()
+            xaddrs = (xaddrs_xpath(root) or [None])[0]
+            if xaddrs:
+                urls = xaddrs.split()
                 url = urls[0] if urls else None
 
                 # Extract port from URL
                 port = 80
                 if url:
-                    port_match = re.search(r':(\d+)/', url)
+                    port_match = _PORT_RE.search(url)
                     if port_match:
                         port = int(port_match.group(1))
 
                 with self.discovery_lock:
                     # Check if already discovered
-                    if not any(cam['ip'] == ip for cam in self.discovered_cameras):
-                        self.discovered_cameras.append({
+                    if ip not in self._cam_by_ip:
+                        self._cam_by_ip[ip] = {
                             'ip': ip,
                             'port': port,
                             'url': url or f'http://{ip}:{port}/onvif/device_service',
                             'name': f"Camera {ip}",
                             'manufacturer': 'Unknown',
                             'model': 'Unknown'
-                        })
+                        }
+                        self._found_event.set()
 
         except Exception as e:
             pass
@@ -234,74 +471,92 @@ class WorkingONVIFDiscovery:
                 ('192.168.1.133', 2020)
             ]
 
+            # Probed together, so the preflight costs one timeout, not one per address
             print(f"[*] Checking known camera addresses...")
-            for ip, port in camera_ips:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(1.0)
-                    result = sock.connect_ex((ip, port))
-                    sock.close()
-                    if result == 0:
-                        cameras.append({
-                            'ip': ip,
-                            'port': port,
-                            'url': f'http://{ip}:{port}/onvif/device_service',
-                            'name': f'Camera {ip}',
-                            'manufacturer': 'Unknown',
-                            'model': 'Unknown'
-                        })
-                        print(f"[+] Found camera at {ip}:{port}")
-                except:
-                    pass
+            for ip, port in self._scan_ports(camera_ips, timeout=1.0):
+                cameras.append({
+                    'ip': ip,
+                    'port': port,
+                    'url': f'http://{ip}:{port}/onvif/device_service',
+                    'name': f'Camera {ip}',
+                    'manufacturer': 'Unknown',
+                    'model': 'Unknown'
+                })
+                print(f"[+] Found camera at {ip}:{port}")
 
             # If fewer than 4 cameras found, do a full network scan
             if len(cameras) < 4:
                 print(f"[*] Scanning {network_prefix}.1-254 on common ports...")
 
-                def check_onvif(ip, port):
-                    try:
-                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                        sock.settimeout(0.5)
-                        result = sock.connect_ex((ip, port))
-                        sock.close()
-                        if result == 0:
-                            return (ip, port)
-                    except:
-                        pass
-                    return None
-
-                with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-                    futures = []
-                    for i in range(1, 255):
-                        ip = f"{network_prefix}.{i}"
-                        # Skip already found IPs
-                        if any(c['ip'] == ip for c in cameras):
-                            continue
-                        for port in self.COMMON_ONVIF_PORTS:
-                            futures.append(executor.submit(check_onvif, ip, port))
-
-                    for future in concurrent.futures.as_completed(futures):
-                        result = future.result()
-                        if result:
-                            ip, port = result
-                            if (ip, port) not in [(c['ip'], c['port']) for c in cameras]:
-                                # Only add if port is 2020, 8080, or 8000 (common camera ports)
-                                if port in [2020, 8080, 8000]:
-                                    cameras.append({
-                                        'ip': ip,
-                                        'port': port,
-                                        'url': f'http://{ip}:{port}/onvif/device_service',
-                                        'name': f'Camera {ip}',
-                                        'manufacturer': 'Unknown',
-                                        'model': 'Unknown'
-                                    })
-                                    print(f"[+] Found camera at {ip}:{port}")
+                # Skip already found IPs
+                found_ips = {c['ip'] for c in cameras}
+                targets = [
+                    (ip, port)
+                    for ip in (f"{network_prefix}.{i}" for i in range(1, 255))
+                    if ip not in found_ips
+                    for port in self.COMMON_ONVIF_PORTS
+                ]
+
+                for ip, port in self._scan_ports(targets, timeout=0.5):
+                    if (ip, port) not in [(c['ip'], c['port']) for c in cameras]:
+                        # Only add if port is 2020, 8080, or 8000 (common camera ports)
+                        if port in [2020, 8080, 8000]:
+                            cameras.append({
+                                'ip': ip,
+                                'port': port,
+                                'url': f'http://{ip}:{port}/onvif/device_service',
+                                'name': f'Camera {ip}',
+                                'manufacturer': 'Unknown',
+                                'model': 'Unknown'
+                            })
+                            print(f"[+] Found camera at {ip}:{port}")
 
         except Exception as e:
             print(f"[!] Network scan error: {e}")
 
         return cameras
 
+    def _scan_ports(self, targets, timeout=0.5) -> List[tuple]:
+        """
+        Find open TCP ports with one event loop instead of a thread per probe
+
+        Args:
+            targets: Iterable of (ip, port) pairs to probe
+            timeout: Connect timeout per probe in seconds
+
+        Returns:
+            list: Open (ip, port) pairs, in the order they answered
+        """
+        return asyncio.run(self._scan_ports_async(targets, timeout))
+
+    async def _scan_ports_async(self, targets, timeout):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SOCKETS)
+
+        async def probe(ip, port):
+            async with semaphore:
+                # A bare non-blocking socket: no stream reader/transport per probe
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                # Let the kernel give up on the connection at the probe deadline (Linux)
+                if hasattr(socket, 'TCP_USER_TIMEOUT'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, int(timeout * 1000))
+                try:
+                    await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout=timeout)
+                except (OSError, asyncio.TimeoutError):
+                    return None
+                finally:
+                    sock.close()
+                return ip, port
+
+        tasks = [asyncio.create_task(probe(ip, port)) for ip, port in targets]
+        open_ports = []
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            if result:
+                open_ports.append(result)
+        return open_ports
+
     def get_camera_info(self, ip, port=80, user='admin', password='admin'):
         """
         Get detailed camera information via ONVIF
@@ -315,45 +570,43 @@ class WorkingONVIFDiscovery:
         Returns:
             dict: Camera information or error dict on failure
         """
+        # zeep is only loaded once a camera is actually queried
+        from zeep.exceptions import Fault
+
         try:
-            # Get WSDL directory from onvif package
-            import os
-            import onvif
-            onvif_dir = os.path.dirname(onvif.__file__)
-            wsdl_dir = os.path.join(onvif_dir, 'wsdl')
-
-            print(f"[ONVIF] Connecting to {ip}:{port} with user '{user}'")
-
-            # Create ONVIF camera connection with WSDL files
-            if os.path.exists(wsdl_dir):
-                print(f"[ONVIF] Using WSDL directory: {wsdl_dir}")
-                camera = ONVIFCamera(ip, port, user, password, wsdl_dir=wsdl_dir)
-            else:
-                print(f"[ONVIF] WSDL not found, trying without WSDL")
-                camera = ONVIFCamera(ip, port, user, password)
+            camera = _open_onvif_camera(ip, port, user, password)
+            media_service = camera.media_service
+            stream_setup = {
+                'Stream': 'RTP-Unicast',
+                'Transport': {'Protocol': 'RTSP'}
+            }
 
-            # Get device information
-            device_service = camera.create_devicemgmt_service()
-            device_info = device_service.GetDeviceInformation()
+            # Independent SOAP calls run concurrently over the shared
+            # keep-alive pool: device information alongside the profiles,
+            # then every profile's stream URI at once
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                # Get device information
+                device_future = executor.submit(camera.device_service.GetDeviceInformation)
 
-            # Get media profiles
-            media_service = camera.create_media_service()
-            profiles = media_service.GetProfiles()
+                # Get media profiles
+                profiles = media_service.GetProfiles()
+
+                uri_futures = [
+                    executor.submit(media_service.GetStreamUri, {
+                        'StreamSetup': stream_setup,
+                        'ProfileToken': profile.token
+                    })
+                    for profile in profiles
+                ]
+                device_info = device_future.result()
 
             # Get stream URIs with credentials embedded
             stream_uris = []
             profile_details = []
 
-            for profile in profiles:
+            for profile, uri_future in zip(profiles, uri_futures):
                 try:
-                    stream_setup = {
-                        'Stream': 'RTP-Unicast',
-                        'Transport': {'Protocol': 'RTSP'}
-                    }
-                    uri = media_service.GetStreamUri({
-                        'StreamSetup': stream_setup,
-                        'ProfileToken': profile.token
-                    })
+                    uri = uri_future.result()
 
                     rtsp_url = str(uri.Uri)
 
@@ -438,6 +691,7 @@ class WorkingONVIFDiscovery:
             dict: Camera info with working RTSP URL or error
         """
         import cv2
+        from app.core.vision.rtsp_onvif import rtsp_capture_options
 
         # Common RTSP URL patterns for various camera brands
         common_paths = [
@@ -456,44 +710,62 @@ class WorkingONVIFDiscovery:
 
         print(f"[RTSP Fallback] Testing common RTSP paths for {ip}")
 
-        for path in common_paths:
-            for rtsp_port in [554, 8554]:  # Try common RTSP ports
+        def probe(rtsp_url):
+            # FFmpeg defaults to UDP for RTSP; TCP sets up faster and also works
+            # with cameras that refuse UDP, and a small buffer without demuxer
+            # delay cuts open latency. Timeouts only take effect at open time.
+            with rtsp_capture_options():
+                cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG, [
+                    cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 3000,  # 3 second timeout
+                    cv2.CAP_PROP_READ_TIMEOUT_MSEC, 3000,
+                ])
+            try:
+                if not cap.isOpened():
+                    return False
+                ret, frame = cap.read()
+                return ret and frame is not None
+            finally:
+                cap.release()
+
+        candidates = [(path, rtsp_port) for path in common_paths for rtsp_port in [554, 8554]]  # Try common RTSP ports
+
+        # Probe a few candidates at a time, so the fallback costs a handful
+        # of open timeouts rather than one per URL without flooding the camera
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        try:
+            futures = []
+            for path, rtsp_port in candidates:
                 rtsp_url = f"rtsp://{username}:{password}@{ip}:{rtsp_port}{path}"
                 print(f"[RTSP Fallback] Testing: rtsp://{username}:***@{ip}:{rtsp_port}{path}")
+                futures.append((executor.submit(probe, rtsp_url), path, rtsp_port, rtsp_url))
 
+            # Collect in candidate order, so the best-ranked working URL wins
+            # rather than whichever probe happens to answer first
+            for future, path, rtsp_port, rtsp_url in futures:
                 try:
-                    cap = cv2.VideoCapture(rtsp_url)
-                    # Check if cap is actually a VideoCapture object (not a boolean)
-                    if cap is not None and hasattr(cap, 'isOpened'):
-                        cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 3000)  # 3 second timeout
-                        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-
-                        if cap.isOpened():
-                            ret, frame = cap.read()
-                            cap.release()
+                    if not future.result():
+                        continue
+                except Exception:
+                    continue
 
-                            if ret and frame is not None:
-                                print(f"[RTSP Fallback] Success! Working URL found: {path} on port {rtsp_port}")
-                                return {
-                                    'ip': ip,
-                                    'port': rtsp_port,
-                                    'manufacturer': 'Unknown',
-                                    'model': 'Unknown (fallback method)',
-                                    'firmware': 'Unknown',
-                                    'serial': 'Unknown',
-                                    'stream_uris': [rtsp_url],
-                                    'profiles': [{
-                                        'name': 'Main Stream',
-                                        'rtsp_url': rtsp_url,
-                                        'complete_url': rtsp_url
-                                    }]
-                                }
-                        cap.release()
-                    else:
-                        # cap is not a valid VideoCapture object
-                        pass
-                except Exception as e:
-                    pass
+                print(f"[RTSP Fallback] Success! Working URL found: {path} on port {rtsp_port}")
+                return {
+                    'ip': ip,
+                    'port': rtsp_port,
+                    'manufacturer': 'Unknown',
+                    'model': 'Unknown (fallback method)',
+                    'firmware': 'Unknown',
+                    'serial': 'Unknown',
+                    'stream_uris': [rtsp_url],
+                    'profiles': [{
+                        'name': 'Main Stream',
+                        'rtsp_url': rtsp_url,
+                        'complete_url': rtsp_url
+                    }]
+                }
+        finally:
+            # Don't wait for lower-ranked probes once one has succeeded
+            executor.shutdown(wait=False, cancel_futures=True)
 
         # If all attempts failed
         print(f"[RTSP Fallback] All common paths failed for {ip}")
@@ -505,13 +777,11 @@ class WorkingONVIFDiscovery:
 
     def _extract_rtsp_suffix(self, rtsp_url):
         """Extract the suffix/path from full RTSP URL"""
-        import re
-
         # Remove credentials if present
-        url = re.sub(r'rtsp://[^@]+@', 'rtsp://', rtsp_url)
+        url = _CRED_RE.sub('rtsp://', rtsp_url)
 
         # Extract path after IP:PORT
-        match = re.search(r'rtsp://[^/]+/(.+)', url)
+        match = _PATH_RE.search(url)
         if match:
             return match.group(1)
 
@@ -520,12 +790,10 @@ class WorkingONVIFDiscovery:
 
     def _build_rtsp_url(self, ip, username, password, suffix, port=554):
         """Build complete RTSP URL with credentials"""
-        import re
-
         # Handle suffix that might already contain port
         if suffix.startswith('rtsp://'):
             # Extract port if present in suffix
-            port_match = re.search(r':(\d+)/', suffix)
+            port_match = _PORT_RE.search(suffix)
             if port_match:
                 port = int(port_match.group(1))
             # Extract just the path
@@ -548,10 +816,8 @@ st.set_page_config(
 )
 
 
-def get_custom_css(dark_mode=False):
-    """Generate custom CSS based on theme."""
-    if dark_mode:
-        return """
+# Theme stylesheets, injected by get_custom_css()
+_CSS_DARK = """
 <style>
     /* Dark Industrial Mode Styling - Professional Dark Theme */
     .main {
@@ -899,8 +1165,8 @@ def get_custom_css(dark_mode=False):
     }
 </style>
 """
-    else:
-        return """
+
+_CSS_LIGHT = """
 <style>
     /* Light Industrial Mode Styling */
     .main {
@@ -1098,6 +1364,35 @@ def get_custom_css(dark_mode=False):
 """
 
 
+def _minify_css(css: str) -> str:
+    """Strip comments and collapse whitespace in a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).strip()
+
+
+# Streamlit drops elements that a rerun does not emit again, so the theme has
+# to be sent on every run; minify it once so each rerun ships the smallest payload
+_CSS_DARK = _minify_css(_CSS_DARK)
+_CSS_LIGHT = _minify_css(_CSS_LIGHT)
+
+
+def get_custom_css(dark_mode=False):
+    """Return the custom CSS for the selected theme."""
+    return _CSS_DARK if dark_mode else _CSS_LIGHT
+
+
+HISTORY_MAXLEN = 2000  # Analyses kept for the analytics charts
+LIVE_METRICS_INTERVAL = 0.5  # Seconds between live metric refreshes while streaming
+STATIC_FRAME_DISTANCE = 4  # Max differing hash bits for a frame to count as unchanged
+DEFAULT_OUTPUT_FPS = 25.0  # Output frame rate when the source video reports none
+
+
+def _new_history_stats():
+    """Return zeroed running totals for the detection history."""
+    return {'n': 0, 'sum_v': 0, 'sum_t': 0.0, 'compliant': 0, 'types': Counter()}
+
+
 def init_session_state():
     """Initialize session state variables."""
     defaults = {
@@ -1108,7 +1403,8 @@ def init_session_state():
         'report': None,
         'video_results': None,
         'dark_mode': True,
-        'history': [],  # Store detection history
+        'history': deque(maxlen=HISTORY_MAXLEN),  # Recent detection history (bounded)
+        'history_stats': _new_history_stats(),  # Running totals over all analyses
         'total_detections': 0,
         'total_violations': 0,
         'webcam_active': False,
@@ -1124,13 +1420,145 @@ def init_session_state():
         'telegram_bot_token': '',
         'telegram_channel_id': '',
         'show_welcome': True,  # Show welcome screen for first-time users
-        'system_initialized': False  # Track if system has been initialized
+        'system_initialized': False,  # Track if system has been initialized
+        'inference_short_side': 640,  # Frames are downscaled to this short side before detection
+        'last_infer_ms': 0.0  # Latest live-stream inference time, drives the adaptive frame skip
     }
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
 
 
+@st.cache_resource(show_spinner=False)
+def _get_detector(model_path: str, conf: float, device: str,
+                  backend: str = "pytorch", calibration_data: Optional[str] = None) -> "PPEDetector":
+    """Create the PPE detector once per process and share it across sessions."""
+    from app.core.vision.detector import create_detector
+
+    detector = create_detector({
+        "model_path": model_path,
+        "confidence_threshold": conf,
+        "device": device,
+        "model_backend": backend,
+        "calibration_data": calibration_data
+    })
+    # Warm up under the loading spinner instead of on the user's first analysis
+    detector.warmup()
+    return detector
+
+
+@st.cache_resource(show_spinner=False)
+def _infer_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Single inference worker shared across sessions.
+
+    One worker serializes access to the shared detector and keeps YOLO off
+    the script thread, so callers can decode and draw while it runs.
+    """
+    return concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+
+
+@st.cache_resource(show_spinner=False)
+def _get_report_generator(provider: str, model: Optional[str], temperature: float) -> ReportGenerator:
+    """Create the report generator once per process and share it across sessions."""
+    report_config = {"provider": provider, "temperature": temperature}
+    if model is not None:
+        report_config["model"] = model
+    return create_report_generator(report_config)
+
+
+def _prep_size(width: int, height: int, short: int = 640) -> tuple:
+    """
+    Frame size after downscaling the short side to at most `short` pixels.
+
+    Args:
+        width: Frame width
+        height: Frame height
+        short: Target short side in pixels
+
+    Returns:
+        (width, height) after _prep_frame(), rounded down to even values
+        so the result is always encodable by libx264
+    """
+    scale = min(short / min(width, height), 1.0)
+    w, h = int(width * scale), int(height * scale)
+    return max(2, w & ~1), max(2, h & ~1)
+
+
+def _prep_frame(img_bgr: np.ndarray, short: int = 640, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Downscale a frame so its short side is at most `short` pixels, with
+    even dimensions (see _prep_size()).
+
+    Args:
+        img_bgr: Input frame
+        short: Target short side in pixels
+        dst: Optional buffer to resize into; used only if its shape matches
+
+    Returns:
+        Resized frame, or the input unchanged if it is already small enough
+    """
+    h, w = img_bgr.shape[:2]
+    size = _prep_size(w, h, short)
+    if size == (w, h):
+        return img_bgr
+    if dst is not None and dst.shape[:2] == (size[1], size[0]):
+        return cv2.resize(img_bgr, size, dst=dst, interpolation=cv2.INTER_AREA)
+    return cv2.resize(img_bgr, size, interpolation=cv2.INTER_AREA)
+
+
+def _frame_buffer(key: str, shape: tuple) -> np.ndarray:
+    """
+    Session-scoped uint8 frame buffer, reallocated only when the shape changes.
+
+    Args:
+        key: Session state key holding the buffer
+        shape: Required (H, W, C) shape
+
+    Returns:
+        Buffer of the requested shape (contents undefined)
+    """
+    buf = st.session_state.get(key)
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, dtype=np.uint8)
+        st.session_state[key] = buf
+    return buf
+
+
+def _average_hash(img_bgr: np.ndarray) -> int:
+    """
+    64-bit average hash of a frame (8x8 grayscale thumbnail thresholded at its mean).
+
+    Args:
+        img_bgr: BGR frame
+
+    Returns:
+        Hash as an int; compare frames by the popcount of the XOR
+    """
+    thumb = cv2.resize(cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY), (8, 8), interpolation=cv2.INTER_AREA)
+    return int.from_bytes(np.packbits(thumb > thumb.mean()).tobytes(), 'little')
+
+
+def _encode_jpeg(img_bgr: np.ndarray, quality: int = 80) -> bytes:
+    """
+    JPEG-encode a BGR frame for st.image.
+
+    Streamlit passes encoded bytes through untouched, so the browser receives
+    a compact JPEG instead of an image re-encoded from the raw array.
+
+    Args:
+        img_bgr: BGR frame
+        quality: JPEG quality (0-100)
+
+    Returns:
+        JPEG bytes
+    """
+    ok, buf = cv2.imencode('.jpg', img_bgr, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return buf.tobytes()
+
+
 def load_models(config):
     """Load detection and report generation models."""
     try:
@@ -1138,12 +1566,13 @@ def load_models(config):
             # Load detector
             if st.session_state.detector is None:
                 try:
-                    detector_config = {
-                        "model_path": config.get('detector.model_path', "yolo11n.pt"),
-                        "confidence_threshold": config.get('detector.confidence_threshold', 0.5),
-                        "device": config.get('detector.device', "cpu")
-                    }
-                    st.session_state.detector = create_detector(detector_config)
+                    st.session_state.detector = _get_detector(
+                        config.get('detector.model_path', "yolo11n.pt"),
+                        config.get('detector.confidence_threshold', 0.5),
+                        config.get('detector.device', "cpu"),
+                        config.get('detector.model_backend', "pytorch"),
+                        config.get('detector.calibration_data')
+                    )
                 except Exception as e:
                     st.error(f"❌ Failed to load PPE detection model: {e}")
                     st.info("💡 Please ensure the model file exists and try again.")
@@ -1152,13 +1581,13 @@ def load_models(config):
             # Load report generator (optional if API key not available)
             if st.session_state.report_generator is None:
                 try:
-                    report_config = {
-                        "provider": config.get('llm.provider', 'ollama'),
-                        "temperature": config.get('llm.temperature', 0.3)
-                    }
-                    if config.get('llm.provider') == "ollama":
-                        report_config["model"] = config.get('llm.model', "llama3")
-                    st.session_state.report_generator = create_report_generator(report_config)
+                    provider = config.get('llm.provider', 'ollama')
+                    model = config.get('llm.model', "llama3") if config.get('llm.provider') == "ollama" else None
+                    st.session_state.report_generator = _get_report_generator(
+                        provider,
+                        model,
+                        config.get('llm.temperature', 0.3)
+                    )
                 except ValueError as e:
                     st.warning(f"⚠️ Report generator not available: {e}")
                     st.info("💡 Detection will still work. Add API key for report generation.")
@@ -1178,177 +1607,10 @@ def load_models(config):
         return True
     except Exception as e:
         st.error(f"❌ Error loading models: {e}")
-        logger.error(f"Model loading failed: {e}")
+        logger.error("Model loading failed: {}", e)
         return False
 
 
-def create_analytics_charts():
-    """Create analytics dashboard with charts."""
-    st.header("📊 Analytics Dashboard")
-
-    # Generate sample data if no history
-    if len(st.session_state.history) == 0:
-        st.info("📈 No detection history yet. Analyze some images to see statistics!")
-        return
-
-    # Prepare data
-    timestamps = [h.get('timestamp', datetime.now()) for h in st.session_state.history]
-    violations = [len(h.get('violations', [])) for h in st.session_state.history]
-    detection_times = [h.get('inference_time_ms', 0) for h in st.session_state.history]
-
-    # Violation types count
-    violation_types = defaultdict(int)
-    for h in st.session_state.history:
-        for v in h.get('violations', []):
-            vtype = v.get('type', 'unknown')
-            violation_types[vtype] += 1
-
-    # Row 1: Key Metrics
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        total_analyses = len(st.session_state.history)
-        st.metric("🔍 Total Analyses", total_analyses,
-                 delta=f"+{total_analyses}" if total_analyses > 0 else None)
-    with col2:
-        total_viol = sum(violations)
-        st.metric("⚠️ Total Violations", total_viol,
-                 delta=f"+{total_viol}" if total_viol > 0 else None,
-                 delta_color="inverse")
-    with col3:
-        avg_time = np.mean(detection_times) if detection_times else 0
-        st.metric("⚡ Avg Detection Time", f"{avg_time:.1f}ms")
-    with col4:
-        compliance_rate = ((total_analyses - sum(1 for v in violations if v > 0)) / total_analyses * 100) if total_analyses > 0 else 100
-        st.metric("✅ Compliance Rate", f"{compliance_rate:.1f}%",
-                 delta=f"{compliance_rate-50:.1f}%" if compliance_rate > 50 else None)
-
-    st.markdown("---")
-
-    # Row 2: Charts
-    col_left, col_right = st.columns(2)
-
-    with col_left:
-        # Violation Trend Line Chart
-        st.subheader("📈 Violation Trend Over Time")
-        if len(timestamps) > 1:
-            fig_trend = go.Figure()
-            fig_trend.add_trace(go.Scatter(
-                x=list(range(len(violations))),
-                y=violations,
-                mode='lines+markers',
-                name='Violations',
-                line=dict(color='#f44336', width=3),
-                marker=dict(size=8, color='#d32f2f'),
-                fill='tozeroy',
-                fillcolor='rgba(244, 67, 54, 0.2)'
-            ))
-            fig_trend.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                xaxis_title="Analysis #",
-                yaxis_title="Violations",
-                hovermode='x unified',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12)
-            )
-            st.plotly_chart(fig_trend, width="stretch")
-        else:
-            st.info("Need more data points for trend analysis")
-
-    with col_right:
-        # Violation Types Pie Chart
-        st.subheader("🎯 Violation Types Distribution")
-        if violation_types:
-            labels = [k.replace('_', ' ').title() for k in violation_types.keys()]
-            values = list(violation_types.values())
-
-            fig_pie = go.Figure(data=[go.Pie(
-                labels=labels,
-                values=values,
-                hole=0.4,
-                marker=dict(colors=px.colors.sequential.RdBu),
-                textinfo='label+percent',
-                textfont=dict(size=12)
-            )])
-            fig_pie.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                showlegend=True,
-                legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.02),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig_pie, width="stretch")
-        else:
-            st.success("✅ No violations detected!")
-
-    # Row 3: Performance Chart
-    st.subheader("⚡ Detection Performance")
-    col_perf1, col_perf2 = st.columns(2)
-
-    with col_perf1:
-        # Detection Time Bar Chart
-        if detection_times:
-            fig_perf = go.Figure()
-            fig_perf.add_trace(go.Bar(
-                x=list(range(len(detection_times))),
-                y=detection_times,
-                marker=dict(
-                    color=detection_times,
-                    colorscale='Viridis',
-                    showscale=True,
-                    colorbar=dict(title="ms")
-                ),
-                text=[f"{t:.1f}ms" for t in detection_times],
-                textposition='outside'
-            ))
-            fig_perf.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                xaxis_title="Analysis #",
-                yaxis_title="Time (ms)",
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=11)
-            )
-            st.plotly_chart(fig_perf, width="stretch")
-
-    with col_perf2:
-        # Compliance Gauge
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=compliance_rate,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Compliance Rate", 'font': {'size': 20}},
-            delta={'reference': 80, 'increasing': {'color': "#4caf50"}},
-            gauge={
-                'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "#00d4ff"},
-                'bar': {'color': "#00d4ff"},
-                'bgcolor': "#1e1e2e" if st.session_state.dark_mode else "white",
-                'borderwidth': 2,
-                'bordercolor': "#00d4ff",
-                'steps': [
-                    {'range': [0, 50], 'color': '#4a1c1c' if st.session_state.dark_mode else '#ffcdd2'},
-                    {'range': [50, 80], 'color': '#2a2a1a' if st.session_state.dark_mode else '#fff9c4'},
-                    {'range': [80, 100], 'color': '#1b2d1b' if st.session_state.dark_mode else '#c8e6c9'}
-                ],
-                'threshold': {
-                    'line': {'color': "#ff6b6b", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-        fig_gauge.update_layout(
-            height=300,
-            margin=dict(l=20, r=20, t=60, b=20),
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(size=12)
-        )
-        st.plotly_chart(fig_gauge, width="stretch")
-
-
 def show_welcome_screen():
     """Display welcome screen for first-time users with step-by-step guide."""
     st.markdown('<h1 class="main-header">🦺 Welcome to SiteGuard AI Pro</h1>', unsafe_allow_html=True)
@@ -1557,6 +1819,176 @@ def show_welcome_screen():
     """, unsafe_allow_html=True)
 
 
+def _record_history(entry):
+    """
+    Append an analysis to the bounded history and fold it into the running stats.
+
+    Args:
+        entry: History record with 'violations' and 'inference_time_ms'
+    """
+    st.session_state.history.append(entry)
+
+    stats = st.session_state.history_stats
+    violations = entry.get('violations', [])
+    stats['n'] += 1
+    stats['sum_v'] += len(violations)
+    stats['sum_t'] += entry.get('inference_time_ms', 0)
+    if not violations:
+        stats['compliant'] += 1
+    stats['types'].update(v.get('type', 'unknown') for v in violations)
+
+
+def _history_to_arrays():
+    """
+    Per-analysis violation counts and inference times as typed arrays.
+
+    Built in a single pass over the history and kept in session state until
+    another analysis is recorded.
+
+    Returns:
+        Tuple of (violations int32 array, inference times float32 array)
+    """
+    history = st.session_state.history
+    n = len(history)
+    version = st.session_state.history_stats['n']
+    cached = st.session_state.get('_history_arrays')
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+
+    violations = np.empty(n, dtype=np.int32)
+    detection_times = np.empty(n, dtype=np.float32)
+    for i, h in enumerate(history):
+        violations[i] = len(h.get('violations', []))
+        detection_times[i] = h.get('inference_time_ms', 0)
+
+    st.session_state._history_arrays = (version, violations, detection_times)
+    return violations, detection_times
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _make_trend_fig(violations: tuple) -> "go.Figure":
+    """Violation trend line chart, rebuilt only when the counts change."""
+    import plotly.graph_objects as go
+
+    fig_trend = go.Figure()
+    fig_trend.add_trace(go.Scatter(
+        x=list(range(len(violations))),
+        y=violations,
+        mode='lines+markers',
+        name='Violations',
+        line=dict(color='#f44336', width=3),
+        marker=dict(size=8, color='#d32f2f'),
+        fill='tozeroy',
+        fillcolor='rgba(244, 67, 54, 0.2)'
+    ))
+    fig_trend.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        xaxis_title="Analysis #",
+        yaxis_title="Violations",
+        hovermode='x unified',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12)
+    )
+    return fig_trend
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _make_types_fig(violation_types: tuple) -> "go.Figure":
+    """Violation type pie chart from (type, count) pairs."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    labels = [k.replace('_', ' ').title() for k, _ in violation_types]
+    values = [count for _, count in violation_types]
+
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=0.4,
+        marker=dict(colors=px.colors.sequential.RdBu),
+        textinfo='label+percent',
+        textfont=dict(size=12)
+    )])
+    fig_pie.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        showlegend=True,
+        legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.02),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig_pie
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _make_perf_fig(detection_times: tuple) -> "go.Figure":
+    """Detection time bar chart, rebuilt only when the timings change."""
+    import plotly.graph_objects as go
+
+    fig_perf = go.Figure()
+    fig_perf.add_trace(go.Bar(
+        x=list(range(len(detection_times))),
+        y=detection_times,
+        marker=dict(
+            color=detection_times,
+            colorscale='Viridis',
+            showscale=True,
+            colorbar=dict(title="ms")
+        ),
+        text=[f"{t:.1f}ms" for t in detection_times],
+        textposition='outside'
+    ))
+    fig_perf.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        xaxis_title="Analysis #",
+        yaxis_title="Time (ms)",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=11)
+    )
+    return fig_perf
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _make_gauge_fig(compliance_rate: float, dark_mode: bool) -> "go.Figure":
+    """Compliance gauge for the given rate and theme."""
+    import plotly.graph_objects as go
+
+    fig_gauge = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=compliance_rate,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Compliance Rate", 'font': {'size': 20}},
+        delta={'reference': 80, 'increasing': {'color': "#4caf50"}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "#00d4ff"},
+            'bar': {'color': "#00d4ff"},
+            'bgcolor': "#1e1e2e" if dark_mode else "white",
+            'borderwidth': 2,
+            'bordercolor': "#00d4ff",
+            'steps': [
+                {'range': [0, 50], 'color': '#4a1c1c' if dark_mode else '#ffcdd2'},
+                {'range': [50, 80], 'color': '#2a2a1a' if dark_mode else '#fff9c4'},
+                {'range': [80, 100], 'color': '#1b2d1b' if dark_mode else '#c8e6c9'}
+            ],
+            'threshold': {
+                'line': {'color': "#ff6b6b", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+    fig_gauge.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=60, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12)
+    )
+    return fig_gauge
+
+
 def create_analytics_charts():
     """Create analytics dashboard with charts."""
     st.header("📊 Analytics Dashboard")
@@ -1566,68 +1998,41 @@ def create_analytics_charts():
         st.info("📈 No detection history yet. Analyze some images to see statistics!")
         return
 
-    # Prepare data
-    timestamps = [h.get('timestamp', datetime.now()) for h in st.session_state.history]
-    violations = [len(h.get('violations', [])) for h in st.session_state.history]
-    detection_times = [h.get('inference_time_ms', 0) for h in st.session_state.history]
-
-    # Violation types count
-    violation_types = defaultdict(int)
-    for h in st.session_state.history:
-        for v in h.get('violations', []):
-            vtype = v.get('type', 'unknown')
-            violation_types[vtype] += 1
+    # Prepare data: metric cards read the running totals, plots the recent window
+    stats = st.session_state.history_stats
+    violations, detection_times = _history_to_arrays()
+    violation_types = stats['types']
 
     # Row 1: Key Metrics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        total_analyses = len(st.session_state.history)
+        total_analyses = stats['n']
         st.metric("🔍 Total Analyses", total_analyses,
                  delta=f"+{total_analyses}" if total_analyses > 0 else None)
     with col2:
-        total_viol = sum(violations)
+        total_viol = stats['sum_v']
         st.metric("⚠️ Total Violations", total_viol,
                  delta=f"+{total_viol}" if total_viol > 0 else None,
                  delta_color="inverse")
     with col3:
-        avg_time = np.mean(detection_times) if detection_times else 0
+        avg_time = stats['sum_t'] / total_analyses
         st.metric("⚡ Avg Detection Time", f"{avg_time:.1f}ms")
     with col4:
-        compliance_rate = ((total_analyses - sum(1 for v in violations if v > 0)) / total_analyses * 100) if total_analyses > 0 else 100
+        compliance_rate = 100 * stats['compliant'] / total_analyses
         st.metric("✅ Compliance Rate", f"{compliance_rate:.1f}%",
                  delta=f"{compliance_rate-50:.1f}%" if compliance_rate > 50 else None)
 
     st.markdown("---")
 
-    # Row 2: Charts
+    # Row 2: Charts (figures are cached on their input data, so a rerun
+    # without new analyses skips Plotly construction entirely)
     col_left, col_right = st.columns(2)
 
     with col_left:
         # Violation Trend Line Chart
         st.subheader("📈 Violation Trend Over Time")
-        if len(timestamps) > 1:
-            fig_trend = go.Figure()
-            fig_trend.add_trace(go.Scatter(
-                x=list(range(len(violations))),
-                y=violations,
-                mode='lines+markers',
-                name='Violations',
-                line=dict(color='#f44336', width=3),
-                marker=dict(size=8, color='#d32f2f'),
-                fill='tozeroy',
-                fillcolor='rgba(244, 67, 54, 0.2)'
-            ))
-            fig_trend.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                xaxis_title="Analysis #",
-                yaxis_title="Violations",
-                hovermode='x unified',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12)
-            )
-            st.plotly_chart(fig_trend, width="stretch")
+        if len(violations) > 1:
+            st.plotly_chart(_make_trend_fig(tuple(violations.tolist())), width="stretch")
         else:
             st.info("Need more data points for trend analysis")
 
@@ -1635,26 +2040,7 @@ def create_analytics_charts():
         # Violation Types Pie Chart
         st.subheader("🎯 Violation Types Distribution")
         if violation_types:
-            labels = [k.replace('_', ' ').title() for k in violation_types.keys()]
-            values = list(violation_types.values())
-
-            fig_pie = go.Figure(data=[go.Pie(
-                labels=labels,
-                values=values,
-                hole=0.4,
-                marker=dict(colors=px.colors.sequential.RdBu),
-                textinfo='label+percent',
-                textfont=dict(size=12)
-            )])
-            fig_pie.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                showlegend=True,
-                legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.02),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig_pie, width="stretch")
+            st.plotly_chart(_make_types_fig(tuple(violation_types.items())), width="stretch")
         else:
             st.success("✅ No violations detected!")
 
@@ -1664,64 +2050,13 @@ def create_analytics_charts():
 
     with col_perf1:
         # Detection Time Bar Chart
-        if detection_times:
-            fig_perf = go.Figure()
-            fig_perf.add_trace(go.Bar(
-                x=list(range(len(detection_times))),
-                y=detection_times,
-                marker=dict(
-                    color=detection_times,
-                    colorscale='Viridis',
-                    showscale=True,
-                    colorbar=dict(title="ms")
-                ),
-                text=[f"{t:.1f}ms" for t in detection_times],
-                textposition='outside'
-            ))
-            fig_perf.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                xaxis_title="Analysis #",
-                yaxis_title="Time (ms)",
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=11)
-            )
-            st.plotly_chart(fig_perf, width="stretch")
+        if len(detection_times):
+            st.plotly_chart(_make_perf_fig(tuple(detection_times.tolist())), width="stretch")
 
     with col_perf2:
         # Compliance Gauge
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=compliance_rate,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Compliance Rate", 'font': {'size': 20}},
-            delta={'reference': 80, 'increasing': {'color': "#4caf50"}},
-            gauge={
-                'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "#00d4ff"},
-                'bar': {'color': "#00d4ff"},
-                'bgcolor': "#1e1e2e" if st.session_state.dark_mode else "white",
-                'borderwidth': 2,
-                'bordercolor': "#00d4ff",
-                'steps': [
-                    {'range': [0, 50], 'color': '#4a1c1c' if st.session_state.dark_mode else '#ffcdd2'},
-                    {'range': [50, 80], 'color': '#2a2a1a' if st.session_state.dark_mode else '#fff9c4'},
-                    {'range': [80, 100], 'color': '#1b2d1b' if st.session_state.dark_mode else '#c8e6c9'}
-                ],
-                'threshold': {
-                    'line': {'color': "#ff6b6b", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-        fig_gauge.update_layout(
-            height=300,
-            margin=dict(l=20, r=20, t=60, b=20),
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(size=12)
-        )
-        st.plotly_chart(fig_gauge, width="stretch")
+        st.plotly_chart(_make_gauge_fig(round(compliance_rate, 1), st.session_state.dark_mode),
+                        width="stretch")
 
 
 def webcam_detection_page():
@@ -1857,7 +2192,7 @@ def webcam_detection_page():
                     cap.release()
             except Exception as e:
                 # Silently ignore camera access errors in cloud environments
-                logger.debug(f"Camera {i} not available: {e}")
+                logger.debug("Camera {} not available: {}", i, e)
                 continue
 
         camera_source = None
@@ -1917,25 +2252,57 @@ def webcam_detection_page():
 
                     st.info(f"📹 {camera_info} opened successfully")
 
+                    # Capture on a background thread; the loop below always
+                    # runs inference on the newest frame
+                    capture = ThreadedCapture(cap)
+
                     # Processing loop
                     frame_count = 0
                     start_time = time.time()
                     processing_times = []
                     last_frame_time = time.time()
+                    last_metrics_time = 0.0
+                    last_hash = None
+                    skip_n = 0
 
-                    while stream_active and cap.isOpened():
-                        ret, frame = cap.read()
+                    while stream_active:
+                        ret, frame = capture.read()
                         if not ret:
                             st.error(f"❌ Failed to read frame from {camera_info}")
                             break
 
                         frame_count += 1
                         frame_start = time.time()
+                        # Resolution is stable while streaming, so resize into the
+                        # previous frame's buffer instead of allocating a new one
+                        frame = _prep_frame(frame, st.session_state.inference_short_side,
+                                            dst=st.session_state.get('_resize_buf'))
+                        st.session_state._resize_buf = frame
+
+                        # Adaptive skip: when inference is slower than the target frame
+                        # interval, only detect on every (skip_n + 1)th frame
+                        skip_frame = skip_n > 0 and frame_count % (skip_n + 1) != 0
+
+                        # Static scene: if the frame barely differs from the last one
+                        # detected on, the annotated frame on screen is still current
+                        static_frame = False
+                        if st.session_state.detector and not skip_frame:
+                            frame_hash = _average_hash(frame)
+                            static_frame = (last_hash is not None
+                                            and (frame_hash ^ last_hash).bit_count() < STATIC_FRAME_DISTANCE)
 
                         # Process frame
-                        if st.session_state.detector:
+                        if static_frame:
+                            pass
+                        elif st.session_state.detector and not skip_frame:
+                            last_hash = frame_hash
                             try:
-                                results = st.session_state.detector.detect(frame, annotate=True)
+                                # Serialize with other sessions on the shared detector
+                                results = _infer_pool().submit(
+                                    st.session_state.detector.detect, frame, annotate=True
+                                ).result()
+                                st.session_state.last_infer_ms = (time.time() - frame_start) * 1000
+                                skip_n = int(st.session_state.last_infer_ms * fps_target / 1000)
 
                                 # Filter detections by confidence for display
                                 filtered_detections = [
@@ -1943,8 +2310,9 @@ def webcam_detection_page():
                                     if d.confidence >= confidence_display
                                 ]
 
-                                # Create display frame with annotations
-                                display_frame = frame.copy()
+                                # Create display frame with annotations (reused buffer)
+                                display_frame = _frame_buffer('_bgr_buf', frame.shape)
+                                np.copyto(display_frame, frame)
 
                                 # Draw detections
                                 for detection in filtered_detections:
@@ -1974,11 +2342,8 @@ def webcam_detection_page():
                                     cv2.putText(display_frame, "VIOLATION DETECTED!",
                                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
 
-                                # Convert to RGB for Streamlit
-                                display_rgb = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-
-                                # Display frame
-                                video_placeholder.image(display_rgb, channels="RGB", width=640)
+                                # Display frame (JPEG-encoded straight from BGR)
+                                video_placeholder.image(_encode_jpeg(display_frame), width=640)
 
                                 # Update stats
                                 stats = st.session_state.webcam_stats
@@ -1992,12 +2357,15 @@ def webcam_detection_page():
                                     current_fps = frame_count / elapsed
                                     stats['avg_fps'] = current_fps
 
-                                # Update live metrics
-                                live_detections.metric("👤 Detections",
-                                                     len([d for d in results.detections if 'person' in d.class_name.lower()]))
-                                live_violations.metric("⚠️ Violations", len(results.violations))
-                                live_fps.metric("🎯 FPS", f"{current_fps:.1f}")
-                                live_status.success(f"Frame {frame_count} processed")
+                                # Update live metrics; only the frame slot refreshes every
+                                # frame, the metric slots at most every LIVE_METRICS_INTERVAL
+                                if frame_start - last_metrics_time >= LIVE_METRICS_INTERVAL:
+                                    last_metrics_time = frame_start
+                                    live_detections.metric("👤 Detections",
+                                                         len([d for d in results.detections if 'person' in d.class_name.lower()]))
+                                    live_violations.metric("⚠️ Violations", len(results.violations))
+                                    live_fps.metric("🎯 FPS", f"{current_fps:.1f}")
+                                    live_status.success(f"Frame {frame_count} processed")
 
                                 # Send Telegram notification if violations detected
                                 if results.has_violations and st.session_state.notifier:
@@ -2009,11 +2377,11 @@ def webcam_detection_page():
                                             timestamp=datetime.now().isoformat()
                                         )
                                     except Exception as e:
-                                        logger.error(f"Failed to send Telegram notification: {e}")
+                                        logger.error("Failed to send Telegram notification: {}", e)
 
                                 # Add to history (sample every 10 frames to avoid overflow)
                                 if frame_count % 10 == 0:
-                                    st.session_state.history.append({
+                                    _record_history({
                                         'timestamp': datetime.now(),
                                         'violations': results.violations,
                                         'detections': len(results.detections),
@@ -2031,10 +2399,12 @@ def webcam_detection_page():
                                 st.error(f"❌ Processing error: {e}")
                                 live_status.error("❌ Error")
                                 break
+                        elif st.session_state.detector:
+                            # Skipped by the adaptive governor, show the raw frame
+                            video_placeholder.image(_encode_jpeg(frame), width=640)
                         else:
                             # Show raw frame if detector not initialized
-                            display_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                            video_placeholder.image(display_rgb, channels="RGB", width=640)
+                            video_placeholder.image(_encode_jpeg(frame), width=640)
                             live_status.warning("⚠️ Detector not initialized")
 
                         # Control frame rate - maintain consistent timing between frames
@@ -2052,7 +2422,7 @@ def webcam_detection_page():
                             break
 
                     # Cleanup
-                    cap.release()
+                    capture.release()
                     st.success("✅ Stream stopped")
 
             except Exception as e:
@@ -2136,6 +2506,8 @@ def webcam_detection_page():
 
 def onvif_detection_page():
     """ONVIF camera discovery and management page."""
+    from app.core.vision.rtsp_onvif import RTSPCamera
+
     st.header("🔍 ONVIF Camera Management")
 
     # Check if running in cloud environment
@@ -2461,14 +2833,19 @@ def onvif_detection_page():
 
                     st.info(f"📹 {camera_info} opened successfully")
 
+                    # Capture on a background thread; the loop below always
+                    # runs inference on the newest frame
+                    capture = ThreadedCapture(cap)
+
                     # Processing loop
                     frame_count = 0
                     start_time = time.time()
                     processing_times = []
                     last_frame_time = time.time()
+                    last_metrics_time = 0.0
 
-                    while stream_active and cap.isOpened():
-                        ret, frame = cap.read()
+                    while stream_active:
+                        ret, frame = capture.read()
                         if not ret:
                             st.error(f"❌ Failed to read frame from {camera_info}")
                             break
@@ -2479,7 +2856,10 @@ def onvif_detection_page():
                         # Process frame
                         if st.session_state.detector:
                             try:
-                                results = st.session_state.detector.detect(frame, annotate=True)
+                                # Serialize with other sessions on the shared detector
+                                results = _infer_pool().submit(
+                                    st.session_state.detector.detect, frame, annotate=True
+                                ).result()
 
                                 # Filter detections by confidence for display
                                 filtered_detections = [
@@ -2487,32 +2867,32 @@ def onvif_detection_page():
                                     if d.confidence >= confidence_display
                                 ]
 
-                                # Create display frame with annotations
-                                display_frame = results.annotated_image.copy()
-
-                                # Update live stats
-                                live_detections.metric("👤 Detections", len(filtered_detections))
-                                live_violations.metric("⚠️ Violations", results.violation_count)
-                                live_fps.metric("🎯 FPS", f"{1.0 / (time.time() - frame_start):.1f}")
+                                # Update live stats at most every LIVE_METRICS_INTERVAL;
+                                # violations are always shown immediately
+                                if results.has_violations or frame_start - last_metrics_time >= LIVE_METRICS_INTERVAL:
+                                    last_metrics_time = frame_start
+                                    live_detections.metric("👤 Detections", len(filtered_detections))
+                                    live_violations.metric("⚠️ Violations", results.violation_count)
+                                    live_fps.metric("🎯 FPS", f"{1.0 / (time.time() - frame_start):.1f}")
 
-                                # Show violations in live status
-                                if results.has_violations:
-                                    live_status.error(f"🚨 {results.violation_count} violations detected!")
-                                else:
-                                    live_status.success("✅ All personnel compliant")
+                                    # Show violations in live status
+                                    if results.has_violations:
+                                        live_status.error(f"🚨 {results.violation_count} violations detected!")
+                                    else:
+                                        live_status.success("✅ All personnel compliant")
 
-                                # Display frame
-                                video_placeholder.image(display_frame, channels="BGR")
+                                # Display frame (updated in place every frame)
+                                video_placeholder.image(_encode_jpeg(results.annotated_image))
 
                                 # Store results for session
                                 st.session_state.results = results
 
                             except Exception as e:
                                 st.error(f"❌ Detection error: {e}")
-                                video_placeholder.image(frame, channels="BGR")
+                                video_placeholder.image(_encode_jpeg(frame))
                         else:
                             # No detector available, just show raw frame
-                            video_placeholder.image(frame, channels="BGR")
+                            video_placeholder.image(_encode_jpeg(frame))
 
                         # Frame rate control
                         current_time = time.time()
@@ -2529,7 +2909,7 @@ def onvif_detection_page():
                             break
 
                     # Cleanup
-                    cap.release()
+                    capture.release()
                     st.success("✅ Stream stopped")
 
                     # Store final stats
@@ -2618,6 +2998,650 @@ def onvif_detection_page():
             st.metric("📊 Frames Processed", stats['frames_processed'])
 
 
+class PyAVVideoWriter:
+    """
+    H.264 writer built on PyAV with fast x264 settings.
+
+    Uses preset veryfast / tune zerolatency and a faststart MP4 (moov atom
+    first), so the result encodes quickly and starts playing in st.video
+    before it is fully downloaded. Same write()/release() interface as
+    cv2.VideoWriter.
+    """
+
+    def __init__(self, path: str, fps: float, size: tuple):
+        """
+        Args:
+            path: Output .mp4 path
+            fps: Output frame rate
+            size: Frame (width, height); both must be even for yuv420p
+        """
+        self.container = av.open(path, mode='w', options={'movflags': '+faststart'})
+        self.stream = self.container.add_stream('libx264', rate=Fraction(fps).limit_denominator(1001))
+        self.stream.width, self.stream.height = size
+        self.stream.pix_fmt = 'yuv420p'
+        self.stream.options = {'preset': 'veryfast', 'tune': 'zerolatency', 'threads': '0'}
+
+    def write(self, frame: np.ndarray):
+        """Encode one BGR frame."""
+        video_frame = av.VideoFrame.from_ndarray(frame, format='bgr24')
+        for packet in self.stream.encode(video_frame):
+            self.container.mux(packet)
+
+    def release(self):
+        """Flush the encoder and finalize the file."""
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+
+def open_video_writer(output_path: str, fps: float, size: tuple):
+    """
+    Open a writer for the annotated output video.
+
+    Prefers PyAV/libx264 with fast settings; otherwise tries OpenCV codecs
+    in order of compatibility.
+
+    Args:
+        output_path: Output .mp4 path
+        fps: Output frame rate
+        size: Frame (width, height)
+
+    Returns:
+        Writer with write()/release(), or None if no codec could be opened
+    """
+    width, height = size
+    # Some containers report no frame rate; fall back to a sane default
+    # rather than handing PyAV or OpenCV a zero/negative rate
+    if not fps > 0:  # also catches NaN
+        logger.warning("Invalid output fps {}, using {}", fps, DEFAULT_OUTPUT_FPS)
+        fps = DEFAULT_OUTPUT_FPS
+    if AV_AVAILABLE and width % 2 == 0 and height % 2 == 0:
+        try:
+            writer = PyAVVideoWriter(output_path, fps, size)
+            logger.info("Using libx264 (PyAV, preset veryfast) for video output")
+            return writer
+        except Exception as e:
+            logger.warning("Failed to initialize PyAV libx264 writer: {}", e)
+
+    # Try multiple codecs for compatibility
+    fourcc_options = [
+        ('mp4v', 'MPEG-4'),  # Most compatible
+        ('avc1', 'H.264'),   # Requires OpenH264
+        ('XVID', 'Xvid'),    # Alternative
+    ]
+    for fourcc_code, codec_name in fourcc_options:
+        try:
+            fourcc = cv2.VideoWriter_fourcc(*fourcc_code)
+            out = cv2.VideoWriter(output_path, fourcc, fps, size)
+            if out.isOpened():
+                logger.info("Using {} codec for video output", codec_name)
+                return out
+        except Exception as e:
+            logger.warning("Failed to initialize {} codec: {}", codec_name, e)
+    return None
+
+
+class PhaseTimer:
+    """
+    Accumulates wall time per pipeline phase with time.perf_counter_ns().
+
+    Each phase must be charged from a single thread (decode on the prefetch
+    thread, detect on the inference worker, encode on the writer thread), so
+    no locking is needed.
+    """
+
+    def __init__(self):
+        self.ns = Counter()
+
+    def add(self, phase: str, start_ns: int):
+        """Charge the time elapsed since `start_ns` to `phase`."""
+        self.ns[phase] += time.perf_counter_ns() - start_ns
+
+    def as_ms(self) -> Dict[str, float]:
+        """Return accumulated time per phase as `{'<phase>_ms': milliseconds}`."""
+        return {f"{phase}_ms": ns / 1e6 for phase, ns in self.ns.items()}
+
+
+class BackgroundVideoWriter:
+    """
+    Wraps a video writer so frames are encoded on a worker thread.
+
+    Frames are handed over through a small bounded queue, letting the next
+    detection overlap with encoding of the previous frame. An encoder error
+    stops the worker and is re-raised from the next write() or release().
+    """
+
+    def __init__(self, writer, maxsize: int = 4, timer: Optional[PhaseTimer] = None):
+        """
+        Args:
+            writer: Opened writer from open_video_writer()
+            maxsize: Maximum number of frames waiting to be encoded
+            timer: Optional PhaseTimer charged with encode time
+        """
+        self.writer = writer
+        self.timer = timer
+        self.error: Optional[BaseException] = None
+        self.frames = queue.Queue(maxsize=maxsize)
+        self.thread = threading.Thread(target=self._run, args=(writer,), daemon=True)
+        self.thread.start()
+
+    def _run(self, writer):
+        try:
+            for frame in iter(self.frames.get, None):
+                if self.timer is None:
+                    writer.write(frame)
+                else:
+                    t0 = time.perf_counter_ns()
+                    writer.write(frame)
+                    self.timer.add('encode', t0)
+        except Exception as e:
+            self.error = e
+
+    def _put(self, item):
+        # A dead worker no longer drains the queue, so never block on it
+        while True:
+            if self.error is not None:
+                raise self.error
+            try:
+                self.frames.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def write(self, frame: np.ndarray):
+        """Queue a frame for encoding (the caller must not mutate it afterwards)."""
+        self._put(frame)
+
+    def release(self):
+        """
+        Flush queued frames and release the underlying writer (idempotent).
+
+        Raises:
+            Exception: The encoder error that stopped the worker, if any
+        """
+        if self.writer is None:
+            return
+        writer, self.writer = self.writer, None
+        try:
+            self._put(None)
+            self.thread.join()
+        finally:
+            writer.release()
+        if self.error is not None:
+            raise self.error
+
+
+class ThreadedCapture:
+    """
+    Reads frames from a cv2.VideoCapture on a background thread.
+
+    Only the newest frame is kept, so a consumer slower than the camera always
+    gets a fresh frame instead of working through a backlog, and capture of the
+    next frame overlaps with inference on the current one.
+    """
+
+    def __init__(self, cap):
+        """
+        Args:
+            cap: Opened cv2.VideoCapture
+        """
+        self.cap = cap
+        self.frames = queue.Queue(maxsize=1)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _put_latest(self, frame):
+        # Drop the stale frame, if any; this thread is the only producer
+        try:
+            self.frames.get_nowait()
+        except queue.Empty:
+            pass
+        self.frames.put(frame)
+
+    def _run(self):
+        while not self.stopped.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            self._put_latest(frame)
+        # Signal end of stream to the consumer
+        self._put_latest(None)
+
+    def read(self, timeout: float = 5.0):
+        """
+        Get the most recent frame.
+
+        Args:
+            timeout: Seconds to wait for a frame
+
+        Returns:
+            Tuple of (success, frame) like cv2.VideoCapture.read()
+        """
+        try:
+            frame = self.frames.get(timeout=timeout)
+        except queue.Empty:
+            return False, None
+        return frame is not None, frame
+
+    def release(self):
+        """Stop the capture thread and release the camera."""
+        self.stopped.set()
+        self.thread.join(timeout=1.0)
+        self.cap.release()
+
+
+def _release_quietly(handle):
+    """Release a capture or writer, logging instead of raising on failure."""
+    if handle is None:
+        return
+    try:
+        handle.release()
+    except Exception as e:
+        logger.warning("Failed to release {}: {}", type(handle).__name__, e)
+
+
+def _unlink_quietly(path: str):
+    """Delete a file if it still exists."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def keep_output_video(path: str) -> str:
+    """
+    Keep an annotated output video on disk for display and download.
+
+    The session holds only the path; the previous output of the session is
+    deleted and any remaining file is removed at interpreter exit.
+
+    Args:
+        path: Path of the finished output video
+
+    Returns:
+        The same path
+    """
+    kept = _kept_videos()
+    previous = st.session_state.get('_output_video_path')
+    if previous and previous != path:
+        kept.discard(previous)
+        _unlink_quietly(previous)
+    st.session_state._output_video_path = path
+    kept.add(path)
+    return path
+
+
+@st.cache_resource(show_spinner=False)
+def _kept_videos() -> set:
+    """
+    Output videos kept across all sessions, removed at interpreter exit.
+
+    Cached so the set and its single atexit hook survive script reruns.
+    """
+    kept = set()
+    atexit.register(_unlink_all, kept)
+    return kept
+
+
+def _unlink_all(paths: set):
+    """Delete every file in `paths` that still exists."""
+    for path in list(paths):
+        _unlink_quietly(path)
+
+
+def open_video_file(video_path: str):
+    """
+    Open a video file, preferring hardware-accelerated FFmpeg decode.
+
+    Falls back to the default backend if the accelerated capture can't be
+    opened.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        cv2.VideoCapture
+    """
+    from app.core.vision.rtsp_onvif import default_capture_options
+
+    # Don't pick up the RTSP-only FFmpeg options of a concurrent camera open
+    with default_capture_options():
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG,
+                               [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        if not cap.isOpened():
+            cap = cv2.VideoCapture(video_path)
+    if cap.isOpened():
+        logger.info("Video decode backend: {} (hw acceleration: {})",
+                    cap.getBackendName(), int(cap.get(cv2.CAP_PROP_HW_ACCELERATION)))
+    return cap
+
+
+def video_fps(cap) -> float:
+    """
+    Frame rate of an opened video, or DEFAULT_OUTPUT_FPS if it reports none.
+
+    Some containers report 0 or NaN; normalizing once keeps the writer,
+    timestamps and captions consistent.
+
+    Args:
+        cap: Opened cv2.VideoCapture
+
+    Returns:
+        Frame rate in frames per second (always > 0)
+    """
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if not fps > 0:  # also catches NaN
+        logger.warning("Video reports invalid fps {}, assuming {}", fps, DEFAULT_OUTPUT_FPS)
+        return DEFAULT_OUTPUT_FPS
+    return fps
+
+
+def sampled_frames(cap, frame_skip: int):
+    """
+    Yield every Nth frame of a video capture.
+
+    Skipped frames are only grab()bed, which advances the stream without the
+    colour conversion and copy; retrieve() decodes just the frames yielded.
+
+    Args:
+        cap: Opened cv2.VideoCapture
+        frame_skip: Yield one frame out of this many
+
+    Yields:
+        Tuple of (frame index, frame)
+    """
+    frame_count = 0
+    while cap.isOpened():
+        if not cap.grab():
+            break
+        if frame_count % frame_skip == 0:
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            yield frame_count, frame
+        frame_count += 1
+
+
+def downscaled_frames(frames, short: int):
+    """
+    Downscale (frame index, frame) pairs with _prep_frame().
+
+    Args:
+        frames: Iterable of (frame index, frame)
+        short: Target short side in pixels
+
+    Yields:
+        Tuple of (frame index, downscaled frame)
+    """
+    for frame_count, frame in frames:
+        yield frame_count, _prep_frame(frame, short)
+
+
+def timed(items, timer: PhaseTimer, phase: str):
+    """
+    Charge the time spent producing each item of `items` to `phase`.
+
+    Args:
+        items: Iterable to time
+        timer: PhaseTimer to charge
+        phase: Phase name
+
+    Yields:
+        Items of `items`, in order
+    """
+    items = iter(items)
+    while True:
+        t0 = time.perf_counter_ns()
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        timer.add(phase, t0)
+        yield item
+
+
+def prefetched(items, maxsize: int = 32):
+    """
+    Iterate over `items` on a producer thread, buffering up to `maxsize` ahead.
+
+    Used to move video decoding off the script thread. The producer is
+    stopped and joined when the consumer finishes or the generator is
+    closed, so the caller must close() it (also on error) before releasing
+    the capture.
+
+    Args:
+        items: Iterable to consume in the background
+        maxsize: Maximum number of buffered items
+
+    Yields:
+        Items of `items`, in order
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    end = object()
+
+    def produce():
+        try:
+            for item in items:
+                while not stop.is_set():
+                    try:
+                        buffer.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+        except Exception as e:
+            buffer.put(e)
+        finally:
+            buffer.put(end)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is end:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Drain so a producer blocked on put() can observe the stop flag
+        while thread.is_alive():
+            try:
+                buffer.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
+
+
+def pipelined_detect(detector, frames, batch_size: int = 1, timer: Optional[PhaseTimer] = None):
+    """
+    Run batched detection on the inference worker one batch ahead of the caller.
+
+    The next batch is decoded and submitted before the previous results are
+    handed back, so decoding and the caller's drawing/encoding overlap with
+    inference, and each batch costs a single forward pass.
+
+    Args:
+        detector: PPEDetector instance
+        frames: Iterable of (frame index, frame)
+        batch_size: Frames per forward pass
+        timer: Optional PhaseTimer charged with detect time
+
+    Yields:
+        Tuple of (frame index, frame, DetectionResult)
+    """
+    def detect(images):
+        if timer is None:
+            return detector.detect_batch(images, batch_size=len(images))
+        t0 = time.perf_counter_ns()
+        try:
+            return detector.detect_batch(images, batch_size=len(images))
+        finally:
+            timer.add('detect', t0)
+
+    pool = _infer_pool()
+    frames = iter(frames)
+    pending = None
+    try:
+        for batch in iter(lambda: list(itertools.islice(frames, batch_size)), []):
+            future = pool.submit(detect, [frame for _, frame in batch])
+            if pending is not None:
+                for (frame_count, frame), results in zip(pending[0], pending[1].result()):
+                    yield frame_count, frame, results
+            pending = (batch, future)
+        if pending is not None:
+            for (frame_count, frame), results in zip(pending[0], pending[1].result()):
+                yield frame_count, frame, results
+    finally:
+        # Stop the frame source (e.g. a prefetched() producer) right away, even
+        # on error, rather than whenever the generator is garbage collected
+        close = getattr(frames, 'close', None)
+        if close is not None:
+            close()
+
+
+def build_violation_timeline(violation_frames: List[Dict]) -> pd.DataFrame:
+    """
+    Build the violation timeline table from columnar arrays.
+
+    Args:
+        violation_frames: Violation frame records from video analysis
+
+    Returns:
+        DataFrame with Frame, Time and Violations columns
+    """
+    count = len(violation_frames)
+    frames = np.fromiter((vf['frame_num'] for vf in violation_frames), dtype=np.int32, count=count)
+    violations = np.fromiter((vf['violation_count'] for vf in violation_frames), dtype=np.int16, count=count)
+    times = np.array([vf['timestamp'] for vf in violation_frames], dtype=object)
+    return pd.DataFrame({'Frame': frames, 'Time': times, 'Violations': violations})
+
+
+# Report download formats: (file extension, MIME type)
+_EXPORT_TYPES = {
+    "PDF": ("pdf", "application/pdf"),
+    "JSON": ("json.gz", "application/gzip"),
+    "TXT": ("txt", "text/plain"),
+    "ZIP": ("zip", "application/zip"),
+}
+
+
+@lru_cache(maxsize=32)
+def _export_file_names(report_id: str, ref_no: Optional[str]) -> Dict[str, str]:
+    """
+    Build the download file name for every export format of a report.
+
+    Args:
+        report_id: Report identifier
+        ref_no: OSHA reference number, used for the PDF when set
+
+    Returns:
+        Mapping of export format to file name
+    """
+    pdf_ext, json_ext, txt_ext, zip_ext = (_EXPORT_TYPES[fmt][0] for fmt in ("PDF", "JSON", "TXT", "ZIP"))
+    return {
+        "PDF": f"OSHA_Violation_{ref_no or report_id}.{pdf_ext}",
+        "JSON": f"{report_id}.{json_ext}",
+        "TXT": f"{report_id}.{txt_ext}",
+        "ZIP": f"{ref_no or report_id}.{zip_ext}",
+    }
+
+
+def _export_payload(export_format: str, report, report_dict: Dict, generator):
+    """
+    Build the download payload for the selected export format.
+
+    Args:
+        export_format: One of the _EXPORT_TYPES keys
+        report: IncidentReport to export
+        report_dict: report.dict_repr for the current render
+        generator: ReportGenerator used for PDF output
+
+    Returns:
+        Payload accepted by st.download_button
+    """
+    if export_format == "PDF":
+        return _pdf_stream(report.report_id, report_dict, generator, report)
+    if export_format == "JSON":
+        return _json_bytes(report.report_id, report_dict)
+    if export_format == "ZIP":
+        return _bundle(report.report_id, report_dict, generator, report)
+    return _txt_bytes(report.report_id, report_dict)
+
+
+# Report metadata attributes shown under "Worker Details", in display order
+_WORKER_FIELDS = (
+    ("worker_name", "Name"),
+    ("worker_id", "Staff ID"),
+    ("company_name", "Company"),
+    ("shift", "Shift"),
+    ("weather_conditions", "Weather"),
+)
+
+
+@st.fragment
+def _render_report_view(report):
+    """
+    Render worker details, report text and export buttons for a report.
+
+    Runs as a fragment so interacting with this section doesn't rerun the
+    whole dashboard.
+
+    Args:
+        report: IncidentReport to display
+    """
+    # OSHA Information Display
+    if report.metadata.worker_name or report.metadata.worker_id or report.metadata.company_name:
+        st.markdown("### 👷 Worker Details")
+        worker_info = [
+            (label, value) for attr, label in _WORKER_FIELDS
+            if (value := getattr(report.metadata, attr, None))
+        ]
+
+        if worker_info:
+            # Plain text skips the frontend markdown parse
+            st.text(" | ".join(f"{label}: {value}" for label, value in worker_info))
+
+    st.markdown("**Report Content**")
+    with st.container(height=300):
+        st.code(report.text, language=None)
+
+    # Export buttons
+    st.subheader("💾 Download Report")
+    report_generator = st.session_state.report_generator
+    report_dict = report.dict_repr
+    export_format = st.radio(
+        "Format",
+        list(_EXPORT_TYPES),
+        horizontal=True,
+        help="PDF: OSHA-compliant report | JSON: gzipped report data | TXT: plain text | ZIP: all three"
+    )
+    st.download_button(
+        "📥 Download Report",
+        data=download_data(lambda: _export_payload(export_format, report, report_dict, report_generator)),
+        file_name=_export_file_names(report.report_id, report.metadata.ref_no)[export_format],
+        mime=_EXPORT_TYPES[export_format][1],
+        type="primary",
+        **_DL_KWARGS
+    )
+
+
+_FOOTER_TEMPLATE = """
+<div style="text-align: center; color: {color}; padding: 2rem 0;">
+    <p><strong>SiteGuard AI Pro</strong> - Enhanced Edition with Live Detection & Analytics</p>
+    <p>Powered by YOLOv8, LLMs & Plotly | CAIE Final Project 2024</p>
+    <p style="font-size: 0.9rem;">© 2024 Muhamad Adib bin Suid</p>
+</div>
+"""
+_FOOTER_DARK = _FOOTER_TEMPLATE.format(color="#999")
+_FOOTER_LIGHT = _FOOTER_TEMPLATE.format(color="#666")
+
+
 def main():
     """Main application with tabs."""
     init_session_state()
@@ -2634,8 +3658,8 @@ def main():
     st.markdown('<h1 class="main-header">🦺 SiteGuard AI Pro</h1>', unsafe_allow_html=True)
     st.markdown(f'<p style="text-align: center; color: {"#999" if st.session_state.dark_mode else "#666"}; font-size: 1.1rem;">Advanced Industrial Safety & Compliance Monitor</p>', unsafe_allow_html=True)
 
-    # Apply theme
-    st.markdown(get_custom_css(st.session_state.dark_mode), unsafe_allow_html=True)
+    # Apply theme (style-only st.html goes to the event container, not the layout)
+    st.html(get_custom_css(st.session_state.dark_mode))
 
     # System status indicator at the top
     if not st.session_state.system_initialized:
@@ -2663,6 +3687,13 @@ def main():
         
         if st.session_state.system_initialized:
             st.success("✅ System Initialized")
+
+            if st.button("♻️ Reload Models", help="Drop the shared models and load them again from disk"):
+                _get_detector.clear()
+                _get_report_generator.clear()
+                st.session_state.detector = None
+                st.session_state.report_generator = None
+                load_models(config)
             
         # Show welcome screen button
         if st.button("📖 Show Welcome Guide"):
@@ -2681,6 +3712,14 @@ def main():
             step=0.05,
             help="Minimum confidence score for detections (higher = fewer false positives)"
         )
+        st.session_state.inference_short_side = st.slider(
+            "Inference Resolution",
+            min_value=320,
+            max_value=1280,
+            value=640,
+            step=32,
+            help="Images and live frames are downscaled so their short side is at most this many pixels before detection"
+        )
 
         # LLM settings
         st.subheader("📝 Report Generation")
@@ -2720,11 +3759,13 @@ def main():
         if st.session_state.detector:
             st.markdown("### 📊 System Stats")
             metrics = st.session_state.detector.get_metrics()
-            st.metric("Total Analyses", len(st.session_state.history))
-            st.metric("Violations Found", sum(len(h.get('violations', [])) for h in st.session_state.history))
+            st.metric("Total Analyses", st.session_state.history_stats['n'])
+            st.metric("Violations Found", st.session_state.history_stats['sum_v'])
 
             if st.button("🗑️ Clear History"):
-                st.session_state.history = []
+                st.session_state.history = deque(maxlen=HISTORY_MAXLEN)
+                st.session_state.history_stats = _new_history_stats()
+                st.session_state.pop('_history_arrays', None)
                 st.rerun()
 
     # Main tabs with better descriptions
@@ -2773,26 +3814,27 @@ def main():
 
         with col_img1:
             if uploaded_file is not None:
-                image = Image.open(uploaded_file)
-                st.image(image, caption="Uploaded Image", width="stretch")
+                # Preview straight from the uploaded bytes (no server-side decode)
+                st.image(uploaded_file, caption="Uploaded Image", width="stretch")
+
+                # Decode straight to a 3-channel BGR array in one pass
+                image_np = cv2.imdecode(np.frombuffer(uploaded_file.getvalue(), np.uint8), cv2.IMREAD_COLOR)
+                if image_np is None:
+                    st.error("❌ Could not decode the uploaded image")
+                    st.stop()
 
                 # Store current image for evidence
-                st.session_state.current_image = image
-
-                # Convert to numpy
-                image_np = np.array(image)
-                if len(image_np.shape) == 2:
-                    image_np = cv2.cvtColor(image_np, cv2.COLOR_GRAY2BGR)
-                elif image_np.shape[2] == 4:
-                    image_np = cv2.cvtColor(image_np, cv2.COLOR_RGBA2BGR)
-                else:
-                    image_np = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
+                st.session_state.current_image = image_np
 
                 if st.button("🔍 Analyze Image", type="primary", disabled=st.session_state.detector is None):
                     if st.session_state.detector:
                         with st.spinner("🔄 Detecting PPE violations..."):
                             start_time = time.time()
-                            results = st.session_state.detector.detect(image_np, annotate=True)
+                            results = _infer_pool().submit(
+                                st.session_state.detector.detect,
+                                _prep_frame(image_np, st.session_state.inference_short_side),
+                                annotate=True
+                            ).result()
                             inference_time = (time.time() - start_time) * 1000
 
                             st.session_state.results = results
@@ -2807,10 +3849,10 @@ def main():
                                         timestamp=datetime.now().isoformat()
                                     )
                                 except Exception as e:
-                                    logger.error(f"Failed to send Telegram notification: {e}")
+                                    logger.error("Failed to send Telegram notification: {}", e)
 
                             # Add to history
-                            st.session_state.history.append({
+                            _record_history({
                                 'timestamp': datetime.now(),
                                 'violations': results.violations,
                                 'detections': len(results.detections),
@@ -2847,8 +3889,7 @@ def main():
 
                 # Display annotated image
                 if hasattr(results, 'annotated_image') and results.annotated_image is not None:
-                    annotated_rgb = cv2.cvtColor(results.annotated_image, cv2.COLOR_BGR2RGB)
-                    st.image(annotated_rgb, caption="Detection Results", width="stretch")
+                    st.image(_encode_jpeg(results.annotated_image, quality=90), caption="Detection Results", width="stretch")
 
                 # Metrics
                 col_m1, col_m2, col_m3 = st.columns(3)
@@ -2882,7 +3923,7 @@ def main():
                                         evidence_dir = Path("data/evidence")
                                         evidence_dir.mkdir(exist_ok=True, parents=True)
                                         evidence_path = evidence_dir / f"violation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-                                        st.session_state.current_image.save(str(evidence_path))
+                                        cv2.imwrite(str(evidence_path), st.session_state.current_image)
                                         visual_evidence_path = str(evidence_path)
                                     except Exception as e:
                                         st.warning(f"Could not save visual evidence: {e}")
@@ -3012,6 +4053,14 @@ def main():
                         value=1,
                         help="Process every Nth frame to speed up analysis"
                     )
+                    batch_size = st.slider(
+                        "Frames per inference batch",
+                        min_value=1,
+                        max_value=16,
+                        value=4,
+                        help="Frames sent to the model in one forward pass",
+                        key="batch_size_tab2"
+                    )
 
                 with col_opt2:
                     confidence_threshold = st.slider(
@@ -3026,16 +4075,17 @@ def main():
                 if st.button("🚀 Process Video", type="primary"):
                     # Save uploaded video to temp file
                     import tempfile
-                    import os
 
+                    # Copy the upload in 1 MiB chunks instead of materializing a second full copy
+                    uploaded_video.seek(0)
                     with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-                        tmp_file.write(uploaded_video.getvalue())
+                        shutil.copyfileobj(uploaded_video, tmp_file, 1 << 20)
                         video_path = tmp_file.name
 
                     try:
                         # Process video
                         with st.spinner("🔄 Processing video frames..."):
-                            cap = cv2.VideoCapture(video_path)
+                            cap = open_video_file(video_path)
 
                             # Check if video opened successfully
                             if cap is None or not hasattr(cap, 'isOpened') or not cap.isOpened():
@@ -3044,119 +4094,94 @@ def main():
 
                             # Get video properties
                             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                            fps = cap.get(cv2.CAP_PROP_FPS)
+                            fps = video_fps(cap)
                             width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
                             height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
 
                             st.info(f"📹 Video: {total_frames} frames @ {fps:.1f} FPS | {width}x{height}")
 
+                            # Sampled frames are downscaled once, on the decode thread, to the
+                            # inference resolution; the annotated output is written at that size
+                            short_side = st.session_state.inference_short_side
+                            width, height = _prep_size(width, height, short_side)
+
                             # Create output video writer with compatible codec
                             output_path = video_path.replace('.mp4', '_annotated.mp4')
-                            # Try multiple codecs for compatibility
-                            fourcc_options = [
-                                ('mp4v', 'MPEG-4'),  # Most compatible
-                                ('avc1', 'H.264'),   # Requires OpenH264
-                                ('XVID', 'Xvid'),    # Alternative
-                            ]
-
-                            out = None
-                            for fourcc_code, codec_name in fourcc_options:
-                                try:
-                                    fourcc = cv2.VideoWriter_fourcc(*fourcc_code)
-                                    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-                                    if out is not None and out.isOpened():
-                                        logger.info(f"Using {codec_name} codec for video output")
-                                        break
-                                    else:
-                                        out = None
-                                except Exception as e:
-                                    logger.warning(f"Failed to initialize {codec_name} codec: {e}")
-                                    continue
+                            # Skipped frames are not written, so scale the declared fps
+                            # to keep the output at the source's wall-clock duration
+                            out = open_video_writer(output_path, fps / frame_skip, (width, height))
 
-                            if out is None or not out.isOpened():
+                            if out is None:
                                 st.error("❌ Failed to initialize video writer with any codec")
                                 st.stop()
 
+                            # Encode on a worker thread so detection doesn't wait on the encoder;
+                            # decode/detect/encode time is accumulated per phase for the summary
+                            timer = PhaseTimer()
+                            out = BackgroundVideoWriter(out, timer=timer)
+
                             # Storage for results
                             all_violations = []
                             violation_frames = []
                             frames_processed = 0
-                            frame_count = 0
 
                             # Progress bar
                             progress_bar = st.progress(0)
                             status_text = st.empty()
 
-                            # Store last detection results for frame interpolation
-                            last_annotated = None
-
-                            while cap.isOpened():
-                                ret, frame = cap.read()
-                                if not ret:
-                                    break
-
-                                # Process every Nth frame
-                                if frame_count % frame_skip == 0:
-                                    # Run detection
-                                    results = st.session_state.detector.detect(frame, annotate=True)
-
-                                    # Filter detections by confidence
-                                    filtered_detections = [
-                                        d for d in results.detections
-                                        if d.confidence >= confidence_threshold
-                                    ]
-
-                                    # Check for violations from DetectionResult
-                                    violations = []
-                                    for violation in results.violations:
-                                        violations.append({
-                                            'type': violation.get('type', 'unknown'),
-                                            'description': violation.get('description', ''),
-                                            'severity': violation.get('severity', 'medium'),
-                                            'confidence': violation.get('confidence', 0.95),
-                                            'frame': frame_count,
-                                            'timestamp': f"{frame_count/fps:.2f}s",
-                                            'osha_standard': violation.get('osha_standard', '')
-                                        })
-
-                                    # Store violations
-                                    all_violations.extend(violations)
-
-                                    # Store violation frames
-                                    if violations:
-                                        violation_frames.append({
-                                            'frame_num': frame_count,
-                                            'timestamp': f"{frame_count/fps:.2f}s",
-                                            'image': results.annotated_image if results.annotated_image is not None else frame,
-                                            'violation_count': len(violations)
-                                        })
+                            # Decode on a producer thread, detect on the inference worker
+                            # one batch ahead, encode on the writer thread
+                            pipeline = pipelined_detect(
+                                st.session_state.detector,
+                                prefetched(timed(downscaled_frames(sampled_frames(cap, frame_skip), short_side), timer, 'decode')),
+                                batch_size, timer
+                            )
+                            for frame_count, frame, results in pipeline:
+                                # Filter detections by confidence
+                                filtered_detections = [
+                                    d for d in results.detections
+                                    if d.confidence >= confidence_threshold
+                                ]
 
-                                    # Create annotated frame
-                                    if results.annotated_image is not None:
-                                        annotated_rgb = cv2.cvtColor(results.annotated_image, cv2.COLOR_BGR2RGB)
-                                        last_annotated = annotated_rgb.copy()
-                                    else:
-                                        annotated_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                                # Check for violations from DetectionResult
+                                # (timestamp formatted once per frame)
+                                timestamp_str = f"{frame_count / fps:.2f}s"
+                                violations = [{
+                                    'type': violation.get('type', 'unknown'),
+                                    'description': violation.get('description', ''),
+                                    'severity': violation.get('severity', 'medium'),
+                                    'confidence': violation.get('confidence', 0.95),
+                                    'frame': frame_count,
+                                    'timestamp': timestamp_str,
+                                    'osha_standard': violation.get('osha_standard', '')
+                                } for violation in results.violations]
+
+                                # Store violations
+                                all_violations.extend(violations)
+
+                                # Store violation frames
+                                if violations:
+                                    violation_frames.append({
+                                        'frame_num': frame_count,
+                                        'timestamp': timestamp_str,
+                                        'jpeg': _encode_jpeg(results.annotated_image if results.annotated_image is not None else frame, quality=85),
+                                        'violation_count': len(violations)
+                                    })
 
-                                    # Write to output video
-                                    out.write(results.annotated_image if results.annotated_image is not None else frame)
+                                # Write to output video
+                                out.write(results.annotated_image if results.annotated_image is not None else frame)
 
-                                    frames_processed += 1
+                                frames_processed += 1
 
                                 # Update progress
                                 progress = min(frame_count / total_frames, 1.0)
                                 progress_bar.progress(progress)
                                 status_text.text(f"Processing frame {frame_count}/{total_frames}...")
 
-                                frame_count += 1
-
                             # Cleanup
                             cap.release()
                             out.release()
-
-                            # Read annotated video for display
-                            with open(output_path, 'rb') as f:
-                                annotated_video_bytes = f.read()
+                            st.session_state.detector.release_memory()
 
                             # Store results
                             video_results = {
@@ -3166,13 +4191,14 @@ def main():
                                 'all_violations': all_violations,
                                 'violation_count': len(all_violations),
                                 'fps': fps,
-                                'annotated_video': annotated_video_bytes
+                                'output_fps': fps / frame_skip,
+                                'annotated_video_path': keep_output_video(output_path),
+                                'phase_ms': timer.as_ms()
                             }
                             st.session_state.video_results = video_results
 
-                            # Clean up temp files
+                            # Clean up the uploaded copy; the output stays on disk
                             os.unlink(video_path)
-                            os.unlink(output_path)
 
                         st.success("✅ Video processing completed!")
 
@@ -3187,16 +4213,25 @@ def main():
                         with col_res3:
                             st.metric("⚠️ Violations Found", video_results['violation_count'])
 
+                        # Per-phase time shows which stage bounds throughput
+                        phase_ms = video_results['phase_ms']
+                        for col, phase in zip(st.columns(3), ('decode', 'detect', 'encode')):
+                            with col:
+                                st.metric(f"⏱️ {phase.title()}", f"{phase_ms.get(f'{phase}_ms', 0.0) / 1000:.1f}s")
+
                         # Show annotated video
                         st.markdown("### 🎥 Annotated Video")
-                        st.video(video_results['annotated_video'])
+                        annotated_video_path = video_results['annotated_video_path']
+                        st.video(annotated_video_path)
+                        st.caption(f"One frame per analysed frame, encoded at {video_results['output_fps']:.1f} fps")
 
-                        # Download button
+                        # Download button (file is read at click time where supported)
                         st.download_button(
                             label="📥 Download Annotated Video",
-                            data=video_results['annotated_video'],
-                            file_name=f"{uploaded_video.name.replace('.mp4', '_annotated.mp4')}",
-                            mime="video/mp4"
+                            data=download_data(lambda: Path(annotated_video_path).read_bytes()),
+                            file_name=f"{Path(uploaded_video.name).stem}_annotated_{video_results['output_fps']:g}fps.mp4",
+                            mime="video/mp4",
+                            **_DL_KWARGS
                         )
 
                         # Violation details
@@ -3204,10 +4239,7 @@ def main():
                             st.markdown("### ⚠️ Violation Details")
 
                             # Summary by type
-                            violation_types = {}
-                            for v in all_violations:
-                                vtype = v['type']
-                                violation_types[vtype] = violation_types.get(vtype, 0) + 1
+                            violation_types = Counter(v['type'] for v in all_violations)
 
                             st.markdown("**Violation Summary:**")
                             for vtype, count in violation_types.items():
@@ -3215,14 +4247,7 @@ def main():
 
                             # Timeline of violations
                             st.markdown("**Violation Timeline:**")
-                            timeline_data = []
-                            for vf in violation_frames:
-                                timeline_data.append({
-                                    'Frame': vf['frame'],
-                                    'Time': vf['timestamp'],
-                                    'Violations': vf['violation_count']
-                                })
-                            st.dataframe(timeline_data, width="stretch")
+                            st.dataframe(build_violation_timeline(violation_frames), width="stretch")
 
                             # Detailed violations
                             with st.expander("📋 All Violations Detected"):
@@ -3242,13 +4267,22 @@ def main():
                     except Exception as e:
                         st.error(f"❌ Video processing error: {str(e)}")
                     finally:
+                        # Stop the decode thread, then release handles so the files
+                        # are closed before unlinking
+                        if 'pipeline' in locals():
+                            pipeline.close()
+                        if 'cap' in locals():
+                            _release_quietly(cap)
+                        if 'out' in locals():
+                            _release_quietly(out)
                         # Cleanup temp files
                         if 'video_path' in locals():
                             try:
                                 os.unlink(video_path)
                             except:
                                 pass
-                        if 'output_path' in locals():
+                        # The output is kept for display unless processing failed
+                        if 'output_path' in locals() and output_path != st.session_state.get('_output_video_path'):
                             try:
                                 if os.path.exists(output_path):
                                     os.unlink(output_path)
@@ -3340,6 +4374,14 @@ def main():
                         value=5,
                         help="Skip frames for faster processing (1 = every frame)"
                     )
+                    batch_size = st.slider(
+                        "Frames per inference batch",
+                        min_value=1,
+                        max_value=16,
+                        value=4,
+                        help="Frames sent to the model in one forward pass",
+                        key="batch_size_tab4"
+                    )
                 with col_opt2:
                     max_frames = st.number_input(
                         "Max frames to process",
@@ -3356,162 +4398,146 @@ def main():
                     else:
                         # Save uploaded video temporarily
                         import tempfile
-                        import os
 
+                        # Copy the upload in 1 MiB chunks instead of materializing a second full copy
+                        uploaded_video.seek(0)
                         with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-                            tmp_file.write(uploaded_video.read())
+                            shutil.copyfileobj(uploaded_video, tmp_file, 1 << 20)
                             video_path = tmp_file.name
 
-                        # Process video
-                        with st.spinner("🔄 Processing video frames..."):
-                            cap = cv2.VideoCapture(video_path)
-
-                            # Check if video opened successfully
-                            if cap is None or not hasattr(cap, 'isOpened') or not cap.isOpened():
-                                st.error(f"❌ Cannot open video file: {video_path}")
-                                st.stop()
-
-                            # Get video properties
-                            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                            fps = cap.get(cv2.CAP_PROP_FPS)
-                            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-
-                            st.info(f"📹 Video: {total_frames} frames @ {fps:.1f} FPS | {width}x{height}")
-
-                            # Create output video writer with compatible codec
-                            output_path = video_path.replace('.mp4', '_annotated.mp4')
-                            # Try multiple codecs for compatibility
-                            fourcc_options = [
-                                ('mp4v', 'MPEG-4'),  # Most compatible
-                                ('avc1', 'H.264'),   # Requires OpenH264
-                                ('XVID', 'Xvid'),    # Alternative
-                            ]
-
-                            out = None
-                            for fourcc_code, codec_name in fourcc_options:
-                                try:
-                                    fourcc = cv2.VideoWriter_fourcc(*fourcc_code)
-                                    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-                                    if out is not None and out.isOpened():
-                                        logger.info(f"Using {codec_name} codec for video output")
-                                        break
-                                    else:
-                                        out = None
-                                except Exception as e:
-                                    logger.warning(f"Failed to initialize {codec_name} codec: {e}")
-                                    continue
-
-                            if out is None or not out.isOpened():
-                                st.error("❌ Failed to initialize video writer with any codec")
-                                st.stop()
-
-                            # Storage for results
-                            all_violations = []
-                            violation_frames = []
-                            frames_processed = 0
-                            frame_count = 0
-
-                            # Progress bar
-                            progress_bar = st.progress(0)
-                            status_text = st.empty()
-
-                            # Store last detection results for frame interpolation
-                            last_annotated = None
-
-                            while cap.isOpened():
-                                ret, frame = cap.read()
-                                if not ret:
-                                    break
-
-                                # Process every Nth frame
-                                if frame_count % frame_skip == 0:
-                                    # Run detection
-                                    results = st.session_state.detector.detect(frame, annotate=True)
-
-                                    # Store the annotated frame
-                                    if results.annotated_image is not None:
-                                        last_annotated = results.annotated_image.copy()
-                                        out.write(last_annotated)
-                                    else:
-                                        last_annotated = frame.copy()
-                                        out.write(frame)
+                        try:
+                            # Process video
+                            with st.spinner("🔄 Processing video frames..."):
+                                cap = open_video_file(video_path)
+
+                                # Check if video opened successfully
+                                if cap is None or not hasattr(cap, 'isOpened') or not cap.isOpened():
+                                    st.error(f"❌ Cannot open video file: {video_path}")
+                                    st.stop()
+
+                                # Get video properties
+                                total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                                fps = video_fps(cap)
+                                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+                                st.info(f"📹 Video: {total_frames} frames @ {fps:.1f} FPS | {width}x{height}")
+
+                                # Sampled frames are downscaled once, on the decode thread, to the
+                                # inference resolution; the annotated output is written at that size
+                                short_side = st.session_state.inference_short_side
+                                width, height = _prep_size(width, height, short_side)
+
+                                # Create output video writer with compatible codec
+                                output_path = video_path.replace('.mp4', '_annotated.mp4')
+                                # Skipped frames are not written, so scale the declared fps
+                                # to keep the output at the source's wall-clock duration
+                                out = open_video_writer(output_path, fps / frame_skip, (width, height))
+
+                                if out is None:
+                                    st.error("❌ Failed to initialize video writer with any codec")
+                                    st.stop()
+
+                                # Encode on a worker thread so detection doesn't wait on the encoder;
+                                # decode/detect/encode time is accumulated per phase for the summary
+                                timer = PhaseTimer()
+                                out = BackgroundVideoWriter(out, timer=timer)
+
+                                # Storage for results
+                                all_violations = []
+                                violation_frames = []
+                                frames_processed = 0
+
+                                # Progress bar
+                                progress_bar = st.progress(0)
+                                status_text = st.empty()
+
+                                # Decode on a producer thread, detect on the inference worker
+                                # one batch ahead, encode on the writer thread
+                                frames = prefetched(timed(downscaled_frames(
+                                    itertools.islice(sampled_frames(cap, frame_skip), int(max_frames)), short_side
+                                ), timer, 'decode'))
+                                pipeline = pipelined_detect(st.session_state.detector, frames, batch_size, timer)
+                                for frame_count, frame, results in pipeline:
+                                    # Write the annotated frame
+                                    out.write(results.annotated_image if results.annotated_image is not None else frame)
 
                                     if results.has_violations:
-                                        # Store violations with timestamp
+                                        # Store violations with timestamp (formatted once per frame)
                                         timestamp = frame_count / fps
-                                        for violation in results.violations:
-                                            violation['frame'] = frame_count
-                                            violation['timestamp'] = f"{int(timestamp//60):02d}:{int(timestamp%60):02d}"
-                                            all_violations.append(violation)
+                                        timestamp_str = f"{int(timestamp // 60):02d}:{int(timestamp % 60):02d}"
+                                        all_violations.extend(
+                                            {**violation, 'frame': frame_count, 'timestamp': timestamp_str}
+                                            for violation in results.violations
+                                        )
 
                                         # Store annotated frame
                                         violation_frames.append({
                                             'frame_num': frame_count,
-                                            'timestamp': f"{int(timestamp//60):02d}:{int(timestamp%60):02d}",
-                                            'image': results.annotated_image,
+                                            'timestamp': timestamp_str,
+                                            'jpeg': _encode_jpeg(results.annotated_image, quality=85),
                                             'violation_count': len(results.violations)
                                         })
 
                                     frames_processed += 1
-                                    if frames_processed >= max_frames:
-                                        break
 
                                     progress = min(frames_processed / max_frames, 1.0)
                                     progress_bar.progress(progress)
                                     status_text.text(f"Processed {frames_processed}/{max_frames} frames | Found {len(violation_frames)} violation frames")
-                                else:
-                                    # Use last annotated frame to prevent blinking
-                                    if last_annotated is not None:
-                                        out.write(last_annotated)
-                                    else:
-                                        out.write(frame)
 
-                                frame_count += 1
-
-                            cap.release()
-                            out.release()
-
-                            # Read annotated video for display
-                            with open(output_path, 'rb') as f:
-                                annotated_video_bytes = f.read()
-
-                            # Clean up temp files
-                            os.unlink(video_path)
-                            os.unlink(output_path)
-
-                            # Store results in session state
-                            st.session_state.video_results = {
-                                'total_frames': total_frames,
-                                'processed_frames': frames_processed,
-                                'violation_frames': violation_frames,
-                                'all_violations': all_violations,
-                                'fps': fps,
-                                'annotated_video': annotated_video_bytes
-                            }
-
-                            # Send Telegram notification if violations detected in video
-                            if all_violations and st.session_state.notifier:
-                                try:
-                                    st.session_state.notifier.send_violation_alert(
-                                        violations=all_violations[:5],  # Send first 5 violations as summary
-                                        location=st.session_state.get('location', 'Industrial Site'),
-                                        site_id=st.session_state.get('site_id'),
-                                        timestamp=datetime.now().isoformat()
-                                    )
-                                except Exception as e:
-                                    logger.error(f"Failed to send Telegram notification: {e}")
+                                cap.release()
+                                out.release()
+                                st.session_state.detector.release_memory()
+
+                                # Store results in session state
+                                st.session_state.video_results = {
+                                    'total_frames': total_frames,
+                                    'processed_frames': frames_processed,
+                                    'violation_frames': violation_frames,
+                                    'all_violations': all_violations,
+                                    'fps': fps,
+                                    'output_fps': fps / frame_skip,
+                                    'annotated_video_path': keep_output_video(output_path),
+                                    'phase_ms': timer.as_ms()
+                                }
 
-                            # Add to history for analytics
-                            st.session_state.history.append({
-                                'timestamp': datetime.now(),
-                                'violations': all_violations,
-                                'detections': frames_processed,
-                                'inference_time_ms': (frames_processed / fps) * 1000 if fps > 0 else 0
-                            })
+                                # Send Telegram notification if violations detected in video
+                                if all_violations and st.session_state.notifier:
+                                    try:
+                                        st.session_state.notifier.send_violation_alert(
+                                            violations=all_violations[:5],  # Send first 5 violations as summary
+                                            location=st.session_state.get('location', 'Industrial Site'),
+                                            site_id=st.session_state.get('site_id'),
+                                            timestamp=datetime.now().isoformat()
+                                        )
+                                    except Exception as e:
+                                        logger.error("Failed to send Telegram notification: {}", e)
+
+                                # Add to history for analytics
+                                _record_history({
+                                    'timestamp': datetime.now(),
+                                    'violations': all_violations,
+                                    'detections': frames_processed,
+                                    'inference_time_ms': (frames_processed / fps) * 1000
+                                })
 
-                            progress_bar.progress(1.0)
-                            status_text.text(f"✅ Complete! Processed {frames_processed} frames, found {len(violation_frames)} frames with violations")
+                                progress_bar.progress(1.0)
+                                status_text.text(f"✅ Complete! Processed {frames_processed} frames, found {len(violation_frames)} frames with violations")
+                        finally:
+                            # Stop the decode thread, then release handles so the files
+                            # are closed before unlinking
+                            if 'pipeline' in locals():
+                                pipeline.close()
+                            elif 'frames' in locals():
+                                frames.close()
+                            if 'cap' in locals():
+                                _release_quietly(cap)
+                            if 'out' in locals():
+                                _release_quietly(out)
+                            # Remove the uploaded copy, and the output unless it was kept
+                            _unlink_quietly(video_path)
+                            if 'output_path' in locals() and output_path != st.session_state.get('_output_video_path'):
+                                _unlink_quietly(output_path)
 
                         # Generate report for video if violations found
                         if len(all_violations) > 0 and st.session_state.report_generator:
@@ -3571,14 +4597,17 @@ def main():
             with col_vres1:
                 # Display annotated video
                 st.markdown("### 🎬 Annotated Video with Detections")
-                st.video(video_results['annotated_video'])
+                annotated_video_path = video_results['annotated_video_path']
+                st.video(annotated_video_path)
+                st.caption(f"One frame per analysed frame, encoded at {video_results['output_fps']:.1f} fps")
 
-                # Download button for annotated video
+                # Download button for annotated video (read at click time where supported)
                 st.download_button(
                     label="⬇️ Download Annotated Video",
-                    data=video_results['annotated_video'],
-                    file_name=f"ppe_detection_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4",
-                    mime="video/mp4"
+                    data=download_data(lambda: Path(annotated_video_path).read_bytes()),
+                    file_name=f"ppe_detection_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{video_results['output_fps']:g}fps.mp4",
+                    mime="video/mp4",
+                    **_DL_KWARGS
                 )
 
             with col_vres2:
@@ -3591,6 +4620,11 @@ def main():
                     violation_rate = len(video_results['violation_frames']) / video_results['processed_frames'] * 100
                     st.metric("Violation Rate", f"{violation_rate:.1f}%")
 
+                # Per-phase time shows which stage bounds throughput
+                phase_ms = video_results.get('phase_ms', {})
+                for phase in ('decode', 'detect', 'encode'):
+                    st.metric(f"{phase.title()} Time", f"{phase_ms.get(f'{phase}_ms', 0.0) / 1000:.1f}s")
+
             # Display violation frames
             if len(video_results['violation_frames']) > 0:
                 st.markdown('<div class="violation-alert">', unsafe_allow_html=True)
@@ -3607,19 +4641,11 @@ def main():
 
                 # Display selected frame
                 selected_frame = video_results['violation_frames'][frame_idx]
-                frame_rgb = cv2.cvtColor(selected_frame['image'], cv2.COLOR_BGR2RGB)
-                st.image(frame_rgb, caption=f"Frame {selected_frame['frame_num']} @ {selected_frame['timestamp']}", width="stretch")
+                st.image(selected_frame['jpeg'], caption=f"Frame {selected_frame['frame_num']} @ {selected_frame['timestamp']}", width="stretch")
 
                 # Violation timeline
                 st.markdown("### 📊 Violation Timeline")
-                timeline_data = []
-                for vf in video_results['violation_frames']:
-                    timeline_data.append({
-                        'Frame': vf['frame_num'],
-                        'Time': vf['timestamp'],
-                        'Violations': vf['violation_count']
-                    })
-                st.dataframe(timeline_data, width="stretch")
+                st.dataframe(build_violation_timeline(video_results['violation_frames']), width="stretch")
 
                 # Detailed violations
                 with st.expander("📋 All Violations Detected"):
@@ -3721,6 +4747,7 @@ def main():
                 report.metadata.shift = shift_info if shift_info != "Unknown" else None
                 report.metadata.weather_conditions = weather if weather != "Unknown" else None
                 report.metadata.violation_categories = updated_violations if updated_violations else None
+                report.invalidate_dict_repr()
 
                 st.success("✅ Report details updated!")
                 st.rerun()
@@ -3736,64 +4763,11 @@ def main():
         with col_r4:
             st.metric("Penalty", f"RM {report.metadata.penalty_amount:.2f}")
 
-        # OSHA Information Display
-        if report.metadata.worker_name or report.metadata.worker_id or report.metadata.company_name:
-            st.markdown("### 👷 Worker Details")
-            worker_info = []
-            if report.metadata.worker_name:
-                worker_info.append(f"**Name:** {report.metadata.worker_name}")
-            if report.metadata.worker_id:
-                worker_info.append(f"**Staff ID:** {report.metadata.worker_id}")
-            if report.metadata.company_name:
-                worker_info.append(f"**Company:** {report.metadata.company_name}")
-            if report.metadata.shift:
-                worker_info.append(f"**Shift:** {report.metadata.shift}")
-            if report.metadata.weather_conditions:
-                worker_info.append(f"**Weather:** {report.metadata.weather_conditions}")
-
-            if worker_info:
-                st.markdown(" | ".join(worker_info))
-
-        st.text_area("Report Content", value=report.text, height=300)
-
-        # Export buttons
-        st.markdown("### 💾 Download Report")
-        col_e1, col_e2, col_e3 = st.columns(3)
-        with col_e1:
-            st.download_button(
-                "📋 OSHA PDF Report",
-                data=st.session_state.report_generator.generate_pdf_report(report),
-                file_name=f"OSHA_Violation_{report.metadata.ref_no or report.report_id}.pdf",
-                mime="application/pdf",
-                type="primary",
-                help="Download professional OSHA-compliant PDF report"
-            )
-        with col_e2:
-            st.download_button(
-                "📄 JSON Data",
-                data=json.dumps(report.to_dict(), indent=2),
-                file_name=f"{report.report_id}.json",
-                mime="application/json",
-                help="Download report data in JSON format"
-            )
-        with col_e3:
-            st.download_button(
-                "📝 Text Report",
-                data=report.text,
-                file_name=f"{report.report_id}.txt",
-                mime="text/plain",
-                help="Download report as plain text"
-            )
+        _render_report_view(report)
 
     # Footer
-    st.markdown("---")
-    st.markdown(f"""
-    <div style="text-align: center; color: {'#999' if st.session_state.dark_mode else '#666'}; padding: 2rem 0;">
-        <p><strong>SiteGuard AI Pro</strong> - Enhanced Edition with Live Detection & Analytics</p>
-        <p>Powered by YOLOv8, LLMs & Plotly | CAIE Final Project 2024</p>
-        <p style="font-size: 0.9rem;">© 2024 Muhamad Adib bin Suid</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.divider()
+    st.html(_FOOTER_DARK if st.session_state.dark_mode else _FOOTER_LIGHT)
 
 
 if __name__ == "__main__":
@@ -3802,7 +4776,6 @@ if __name__ == "__main__":
     except Exception as e:
         st.error(f"🚨 Application Error: {str(e)}")
         st.error("Please check the logs for more details.")
-        import traceback
-        st.code(traceback.format_exc(), language="text")
-        logger.error(f"Application startup failed: {e}")
-        logger.error(traceback.format_exc())
+        tb = traceback.format_exc()
+        st.code(tb, language="text")
+        logger.error("Application startup failed: {}\n{}", e, tb)
@@ -4,6 +4,7 @@ Demo script showing how to manually add the known camera
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add project root to path so we can import app modules
@@ -12,6 +13,53 @@ sys.path.insert(0, str(project_root))
 
 from app.core.vision.rtsp_onvif import RTSPCamera
 
+
+def check_camera(cam):
+    """
+    Test the RTSP connection to one camera.
+
+    Output is collected instead of printed so concurrent tests don't
+    interleave their lines.
+
+    Returns:
+        Tuple of (output lines, camera config dict or None on failure)
+    """
+    ip = cam['ip']
+    username = cam['username']
+    password = cam['password']
+    port = cam['port']
+    stream_path = cam['stream_path']
+
+    rtsp_url = f"rtsp://{username}:{password}@{ip}:{port}{stream_path}"
+
+    lines = [
+        f"🔍 Testing camera: {ip}",
+        f"   RTSP URL: rtsp://{username}:***@{ip}:{port}{stream_path}",
+    ]
+
+    try:
+        rtsp_camera = RTSPCamera(rtsp_url, username, password)
+        connected = rtsp_camera.connect()
+
+        if connected and rtsp_camera.cap and rtsp_camera.cap.isOpened():
+            lines.append("✅ RTSP connection successful!")
+            rtsp_camera.cap.release()
+
+            return lines, {
+                'name': f"Camera ({ip})",
+                'ip': ip,
+                'rtsp_url': rtsp_url,
+                'username': username,
+                'password': password
+            }
+        lines.append("❌ RTSP connection failed")
+
+    except Exception as e:
+        lines.append(f"❌ RTSP connection error: {str(e)}")
+
+    return lines, None
+
+
 def demo_manual_camera_entry():
     """Demo of manually adding the known camera."""
 
@@ -37,38 +85,14 @@ def demo_manual_camera_entry():
 
     successful_cameras = []
 
-    for cam in cameras:
-        ip = cam['ip']
-        username = cam['username']
-        password = cam['password']
-        port = cam['port']
-        stream_path = cam['stream_path']
-
-        rtsp_url = f"rtsp://{username}:{password}@{ip}:{port}{stream_path}"
-
-        print(f"🔍 Testing camera: {ip}")
-        print(f"   RTSP URL: rtsp://{username}:***@{ip}:{port}{stream_path}")
-
-        try:
-            rtsp_camera = RTSPCamera(rtsp_url, username, password)
-            connected = rtsp_camera.connect()
-
-            if connected and rtsp_camera.cap and rtsp_camera.cap.isOpened():
-                print("✅ RTSP connection successful!")
-                rtsp_camera.cap.release()
-
-                successful_cameras.append({
-                    'name': f"Camera ({ip})",
-                    'ip': ip,
-                    'rtsp_url': rtsp_url,
-                    'username': username,
-                    'password': password
-                })
-            else:
-                print("❌ RTSP connection failed")
-
-        except Exception as e:
-            print(f"❌ RTSP connection error: {str(e)}")
+    # Test all cameras at once: total time is the slowest RTSP setup, not the sum
+    with ThreadPoolExecutor(max_workers=len(cameras)) as executor:
+        futures = [executor.submit(check_camera, cam) for cam in cameras]
+        for future in as_completed(futures):
+            lines, camera = future.result()
+            print("\n".join(lines))
+            if camera:
+                successful_cameras.append(camera)
 
     print(f"\n🎯 Results: {len(successful_cameras)}/{len(cameras)} cameras configured successfully")
 
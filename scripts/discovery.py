@@ -1,21 +1,110 @@
+import onvif
 from onvif import ONVIFCamera
 from zeep.exceptions import Fault
+from zeep.transports import Transport
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import etree
+import os
+import sys
 import socket
 import threading
 import time
 import uuid
 import re
+import asyncio
+import selectors
 import concurrent.futures
+from functools import lru_cache
 from typing import List, Dict, Optional
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Add project root to path so the app's RTSP settings can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# WSDL files shipped with the onvif package, resolved once
+WSDL_DIR = os.path.join(os.path.dirname(onvif.__file__), 'wsdl')
+
+# One keep-alive HTTP pool shared by every camera's SOAP clients, so
+# successive ONVIF calls reuse connections instead of reconnecting
+_soap_session = requests.Session()
+_soap_session.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+_soap_session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+SOAP_TRANSPORT = Transport(session=_soap_session)
+
+# Probe replies are untrusted network input: no entity expansion, no network access
+_PROBE_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+XADDRS_XPATH = etree.XPath(
+    '//d:XAddrs/text()',
+    namespaces={'d': 'http://schemas.xmlsoap.org/ws/2005/04/discovery'}
+)
+
+# RTSP URL parts: embedded credentials, path after host[:port], and port
+_CRED_RE = re.compile(r'rtsp://[^@]+@')
+_PATH_RE = re.compile(r'rtsp://[^/]+/(.+)')
+_PORT_RE = re.compile(r':(\d+)/')
+
+
+@lru_cache(maxsize=64)
+def _open_onvif_camera(ip, port, user, password):
+    """
+    Connect to an ONVIF camera, caching the client per camera and credentials
+
+    Building an ONVIFCamera parses the WSDL files and creates zeep clients,
+    so repeat queries of the same camera reuse the cached object together
+    with its device and media services.
+
+    Returns:
+        ONVIFCamera with `device_service` and `media_service` attributes
+    """
+    print(f"[ONVIF] Connecting to {ip}:{port} with user '{user}'")
+
+    # Create ONVIF camera connection with WSDL files
+    if os.path.exists(WSDL_DIR):
+        print(f"[ONVIF] Using WSDL directory: {WSDL_DIR}")
+        camera = ONVIFCamera(ip, port, user, password, wsdl_dir=WSDL_DIR, transport=SOAP_TRANSPORT)
+    else:
+        print(f"[ONVIF] WSDL not found, trying without WSDL")
+        camera = ONVIFCamera(ip, port, user, password, transport=SOAP_TRANSPORT)
+
+    camera.device_service = camera.create_devicemgmt_service()
+    camera.media_service = camera.create_media_service()
+    return camera
+
+
 class ONVIFDiscovery:
     """ONVIF camera discovery and management"""
 
     COMMON_ONVIF_PORTS = [2020, 80, 8080, 8000, 8899, 10080]
+    # Upper bound on sockets open at once during a port scan
+    MAX_CONCURRENT_SOCKETS = 512
+    # Once a camera has answered, keep listening this long for slower ones (seconds)
+    MIN_PROBE_WINDOW = 0.5
+    # WS-Discovery Types to probe for (namespace, type); devices only answer
+    # probes whose Types they match
+    PROBE_TYPES = (
+        ('http://www.onvif.org/ver10/network/wsdl', 'NetworkVideoTransmitter'),
+        ('http://www.onvif.org/ver10/device/wsdl', 'Device'),
+        ('http://www.onvif.org/ver10/network/wsdl', 'NetworkVideoDisplay'),
+    )
 
     def __init__(self):
-        self.discovered_cameras = []
+        # Discovered cameras keyed by IP, in discovery order
+        self._cam_by_ip: Dict[str, Dict] = {}
         self.discovery_lock = threading.Lock()
+        # Set when WS-Discovery finds the first camera
+        self._found_event = threading.Event()
+
+    @property
+    def discovered_cameras(self) -> List[Dict]:
+        """Cameras found by the current or last discovery run"""
+        with self.discovery_lock:
+            return list(self._cam_by_ip.values())
 
     def discover_cameras(self, timeout=5):
         """
@@ -29,7 +118,9 @@ class ONVIFDiscovery:
         """
         print(f"[*] Starting ONVIF camera discovery (timeout: {timeout}s)...")
 
-        self.discovered_cameras = []
+        with self.discovery_lock:
+            self._cam_by_ip = {}
+        self._found_event.clear()
 
         # Try WS-Discovery first
         discovery_thread = threading.Thread(
@@ -41,21 +132,21 @@ class ONVIFDiscovery:
         discovery_thread.join(timeout + 1)
 
         # If WS-Discovery failed, use network scan
-        if len(self.discovered_cameras) == 0:
+        if not self._cam_by_ip:
             print("[*] WS-Discovery failed, attempting network scan...")
             scanned_cameras = self._scan_local_network()
             with self.discovery_lock:
-                self.discovered_cameras.extend(scanned_cameras)
+                for cam in scanned_cameras:
+                    self._cam_by_ip.setdefault(cam['ip'], cam)
 
-        print(f"[+] Found {len(self.discovered_cameras)} camera(s)")
-        return self.discovered_cameras
+        cameras = self.discovered_cameras
+        print(f"[+] Found {len(cameras)} camera(s)")
+        return cameras
 
     def _ws_discovery(self, timeout):
         """Perform WS-Discovery on local network"""
-        import xml.etree.ElementTree as ET
-
-        # WS-Discovery probe message
-        probe_msg = (
+        # WS-Discovery probe messages, one per probe type, each with its own MessageID
+        probe_msgs = [(
             '<?xml version="1.0" encoding="UTF-8"?>'
             '<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" '
             'xmlns:a="http://schemas.xmlsoap.org/ws/2004/08/addressing">'
@@ -67,81 +158,128 @@ class ONVIFDiscovery:
             '<s:Body>'
             '<Probe xmlns="http://schemas.xmlsoap.org/ws/2005/04/discovery">'
             '<d:Types xmlns:d="http://schemas.xmlsoap.org/ws/2005/04/discovery" '
-            'xmlns:dp0="http://www.onvif.org/ver10/network/wsdl">dp0:NetworkVideoTransmitter</d:Types>'
+            'xmlns:dp0="' + namespace + '">dp0:' + probe_type + '</d:Types>'
             '</Probe>'
             '</s:Body>'
             '</s:Envelope>'
-        ).encode('utf-8')
-
-        # Create UDP socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        sock.settimeout(timeout)
+        ).encode('utf-8') for namespace, probe_type in self.PROBE_TYPES]
 
         # Multicast address for WS-Discovery
         multicast_addr = ('239.255.255.250', 3702)
 
-        try:
-            # Send probe
-            sock.sendto(probe_msg, multicast_addr)
-
-            # Also try broadcast
+        # One UDP socket per interface: on multi-homed hosts (docker, VPN,
+        # several NICs) the OS would send a single probe out of one NIC only
+        sockets = []
+        for local_ip in self._local_ipv4_addresses():
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             try:
-                sock.sendto(probe_msg, ('255.255.255.255', 3702))
-            except:
-                pass
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(local_ip))
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+                sock.bind((local_ip, 0))
+                sock.setblocking(False)
+            except OSError:
+                sock.close()
+                continue
+            sockets.append(sock)
+
+        selector = selectors.DefaultSelector()
+        try:
+            for sock in sockets:
+                # Send all probe types back-to-back; replies are deduplicated by IP
+                try:
+                    for probe_msg in probe_msgs:
+                        sock.sendto(probe_msg, multicast_addr)
+                except OSError:
+                    continue
 
-            # Receive responses
-            start_time = time.time()
-            while time.time() - start_time < timeout:
+                # Also try broadcast
                 try:
-                    data, addr = sock.recvfrom(65536)
-                    self._parse_probe_match(data, addr[0])
-                except socket.timeout:
-                    break
-                except Exception as e:
+                    for probe_msg in probe_msgs:
+                        sock.sendto(probe_msg, ('255.255.255.255', 3702))
+                except OSError:
                     pass
 
+                selector.register(sock, selectors.EVENT_READ)
+
+            # Receive responses from every interface in one loop
+            start = time.monotonic()
+            deadline = start + timeout
+            while selector.get_map():
+                # Stop early once a camera has answered and the minimum
+                # window for slower cameras has passed
+                if self._found_event.is_set():
+                    deadline = min(deadline, start + self.MIN_PROBE_WINDOW)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    try:
+                        data, addr = key.fileobj.recvfrom(65536)
+                    except OSError:
+                        continue
+                    self._parse_probe_match(data, addr[0])
+
         finally:
-            sock.close()
+            selector.close()
+            for sock in sockets:
+                sock.close()
+
+    @staticmethod
+    def _local_ipv4_addresses() -> List[str]:
+        """IPv4 addresses of the local non-loopback interfaces to probe from"""
+        if PSUTIL_AVAILABLE:
+            addresses = [
+                addr.address
+                for addrs in psutil.net_if_addrs().values()
+                for addr in addrs
+                if addr.family == socket.AF_INET and not addr.address.startswith('127.')
+            ]
+            if addresses:
+                return addresses
+
+        # Fall back to the interface holding the default route
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("8.8.8.8", 80))
+                return [s.getsockname()[0]]
+        except OSError:
+            return ['0.0.0.0']
 
     def _parse_probe_match(self, data, ip):
         """Parse WS-Discovery probe match response"""
-        try:
-            import xml.etree.ElementTree as ET
+        # Skip replies without XAddrs (e.g. other hosts' probes) before parsing
+        if b'XAddrs' not in data:
+            return
 
-            root = ET.fromstring(data.decode('utf-8'))
+        try:
+            root = etree.fromstring(data, _PROBE_PARSER)
 
             # Extract XAddrs (camera URLs)
-            namespaces = {
-                's': 'http://www.w3.org/2003/05/soap-envelope',
-                'a': 'http://schemas.xmlsoap.org/ws/2004/08/addressing',
-                'd': 'http://schemas.xmlsoap.org/ws/2005/04/discovery'
-            }
-
-            xaddrs = root.find('.//d:XAddrs', namespaces)
-            if xaddrs is not None and xaddrs.text:
-                urls = xaddrs.text.split()
+            xaddrs = (XADDRS_XPATH(root) or [None])[0]
+            if xaddrs:
+                urls = xaddrs.split()
                 url = urls[0] if urls else None
 
                 # Extract port from URL
                 port = 80
                 if url:
-                    port_match = re.search(r':(\d+)/', url)
+                    port_match = _PORT_RE.search(url)
                     if port_match:
                         port = int(port_match.group(1))
 
                 with self.discovery_lock:
                     # Check if already discovered
-                    if not any(cam['ip'] == ip for cam in self.discovered_cameras):
-                        self.discovered_cameras.append({
+                    if ip not in self._cam_by_ip:
+                        self._cam_by_ip[ip] = {
                             'ip': ip,
                             'port': port,
                             'url': url or f'http://{ip}:{port}/onvif/device_service',
                             'name': f"Camera {ip}",
                             'manufacturer': 'Unknown',
                             'model': 'Unknown'
-                        })
+                        }
+                        self._found_event.set()
 
         except Exception as e:
             pass
@@ -169,74 +307,92 @@ class ONVIFDiscovery:
                 ('192.168.1.133', 2020)
             ]
 
+            # Probed together, so the preflight costs one timeout, not one per address
             print(f"[*] Checking known camera addresses...")
-            for ip, port in camera_ips:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(1.0)
-                    result = sock.connect_ex((ip, port))
-                    sock.close()
-                    if result == 0:
-                        cameras.append({
-                            'ip': ip,
-                            'port': port,
-                            'url': f'http://{ip}:{port}/onvif/device_service',
-                            'name': f'Camera {ip}',
-                            'manufacturer': 'Unknown',
-                            'model': 'Unknown'
-                        })
-                        print(f"[+] Found camera at {ip}:{port}")
-                except:
-                    pass
+            for ip, port in self._scan_ports(camera_ips, timeout=1.0):
+                cameras.append({
+                    'ip': ip,
+                    'port': port,
+                    'url': f'http://{ip}:{port}/onvif/device_service',
+                    'name': f'Camera {ip}',
+                    'manufacturer': 'Unknown',
+                    'model': 'Unknown'
+                })
+                print(f"[+] Found camera at {ip}:{port}")
 
             # If fewer than 4 cameras found, do a full network scan
             if len(cameras) < 4:
                 print(f"[*] Scanning {network_prefix}.1-254 on common ports...")
 
-                def check_onvif(ip, port):
-                    try:
-                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                        sock.settimeout(0.5)
-                        result = sock.connect_ex((ip, port))
-                        sock.close()
-                        if result == 0:
-                            return (ip, port)
-                    except:
-                        pass
-                    return None
-
-                with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-                    futures = []
-                    for i in range(1, 255):
-                        ip = f"{network_prefix}.{i}"
-                        # Skip already found IPs
-                        if any(c['ip'] == ip for c in cameras):
-                            continue
-                        for port in self.COMMON_ONVIF_PORTS:
-                            futures.append(executor.submit(check_onvif, ip, port))
-
-                    for future in concurrent.futures.as_completed(futures):
-                        result = future.result()
-                        if result:
-                            ip, port = result
-                            if (ip, port) not in [(c['ip'], c['port']) for c in cameras]:
-                                # Only add if port is 2020, 8080, or 8000 (common camera ports)
-                                if port in [2020, 8080, 8000]:
-                                    cameras.append({
-                                        'ip': ip,
-                                        'port': port,
-                                        'url': f'http://{ip}:{port}/onvif/device_service',
-                                        'name': f'Camera {ip}',
-                                        'manufacturer': 'Unknown',
-                                        'model': 'Unknown'
-                                    })
-                                    print(f"[+] Found camera at {ip}:{port}")
+                # Skip already found IPs
+                found_ips = {c['ip'] for c in cameras}
+                targets = [
+                    (ip, port)
+                    for ip in (f"{network_prefix}.{i}" for i in range(1, 255))
+                    if ip not in found_ips
+                    for port in self.COMMON_ONVIF_PORTS
+                ]
+
+                for ip, port in self._scan_ports(targets, timeout=0.5):
+                    if (ip, port) not in [(c['ip'], c['port']) for c in cameras]:
+                        # Only add if port is 2020, 8080, or 8000 (common camera ports)
+                        if port in [2020, 8080, 8000]:
+                            cameras.append({
+                                'ip': ip,
+                                'port': port,
+                                'url': f'http://{ip}:{port}/onvif/device_service',
+                                'name': f'Camera {ip}',
+                                'manufacturer': 'Unknown',
+                                'model': 'Unknown'
+                            })
+                            print(f"[+] Found camera at {ip}:{port}")
 
         except Exception as e:
             print(f"[!] Network scan error: {e}")
 
         return cameras
 
+    def _scan_ports(self, targets, timeout=0.5) -> List[tuple]:
+        """
+        Find open TCP ports with one event loop instead of a thread per probe
+
+        Args:
+            targets: Iterable of (ip, port) pairs to probe
+            timeout: Connect timeout per probe in seconds
+
+        Returns:
+            list: Open (ip, port) pairs, in the order they answered
+        """
+        return asyncio.run(self._scan_ports_async(targets, timeout))
+
+    async def _scan_ports_async(self, targets, timeout):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SOCKETS)
+
+        async def probe(ip, port):
+            async with semaphore:
+                # A bare non-blocking socket: no stream reader/transport per probe
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                # Let the kernel give up on the connection at the probe deadline (Linux)
+                if hasattr(socket, 'TCP_USER_TIMEOUT'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, int(timeout * 1000))
+                try:
+                    await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout=timeout)
+                except (OSError, asyncio.TimeoutError):
+                    return None
+                finally:
+                    sock.close()
+                return ip, port
+
+        tasks = [asyncio.create_task(probe(ip, port)) for ip, port in targets]
+        open_ports = []
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            if result:
+                open_ports.append(result)
+        return open_ports
+
     def get_camera_info(self, ip, port=80, user='admin', password='admin'):
         """
         Get detailed camera information via ONVIF (same as ONVIF Device Manager)
@@ -251,44 +407,39 @@ class ONVIFDiscovery:
             dict: Camera information or error dict on failure
         """
         try:
-            # Get WSDL directory from onvif package
-            import os
-            import onvif
-            onvif_dir = os.path.dirname(onvif.__file__)
-            wsdl_dir = os.path.join(onvif_dir, 'wsdl')
-
-            print(f"[ONVIF] Connecting to {ip}:{port} with user '{user}'")
-
-            # Create ONVIF camera connection with WSDL files
-            if os.path.exists(wsdl_dir):
-                print(f"[ONVIF] Using WSDL directory: {wsdl_dir}")
-                camera = ONVIFCamera(ip, port, user, password, wsdl_dir=wsdl_dir)
-            else:
-                print(f"[ONVIF] WSDL not found, trying without WSDL")
-                camera = ONVIFCamera(ip, port, user, password)
+            camera = _open_onvif_camera(ip, port, user, password)
+            media_service = camera.media_service
+            stream_setup = {
+                'Stream': 'RTP-Unicast',
+                'Transport': {'Protocol': 'RTSP'}
+            }
 
-            # Get device information
-            device_service = camera.create_devicemgmt_service()
-            device_info = device_service.GetDeviceInformation()
+            # Independent SOAP calls run concurrently over the shared
+            # keep-alive pool: device information alongside the profiles,
+            # then every profile's stream URI at once
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                # Get device information
+                device_future = executor.submit(camera.device_service.GetDeviceInformation)
 
-            # Get media profiles
-            media_service = camera.create_media_service()
-            profiles = media_service.GetProfiles()
+                # Get media profiles
+                profiles = media_service.GetProfiles()
+
+                uri_futures = [
+                    executor.submit(media_service.GetStreamUri, {
+                        'StreamSetup': stream_setup,
+                        'ProfileToken': profile.token
+                    })
+                    for profile in profiles
+                ]
+                device_info = device_future.result()
 
             # Get stream URIs with credentials embedded
             stream_uris = []
             profile_details = []
 
-            for profile in profiles:
+            for profile, uri_future in zip(profiles, uri_futures):
                 try:
-                    stream_setup = {
-                        'Stream': 'RTP-Unicast',
-                        'Transport': {'Protocol': 'RTSP'}
-                    }
-                    uri = media_service.GetStreamUri({
-                        'StreamSetup': stream_setup,
-                        'ProfileToken': profile.token
-                    })
+                    uri = uri_future.result()
 
                     rtsp_url = str(uri.Uri)
 
@@ -373,6 +524,7 @@ class ONVIFDiscovery:
             dict: Camera info with working RTSP URL or error
         """
         import cv2
+        from app.core.vision.rtsp_onvif import rtsp_capture_options
 
         # Common RTSP URL patterns for various camera brands
         common_paths = [
@@ -391,39 +543,62 @@ class ONVIFDiscovery:
 
         print(f"[RTSP Fallback] Testing common RTSP paths for {ip}")
 
-        for path in common_paths:
-            for rtsp_port in [554, 8554]:  # Try common RTSP ports
+        def probe(rtsp_url):
+            # FFmpeg defaults to UDP for RTSP; TCP sets up faster and also works
+            # with cameras that refuse UDP, and a small buffer without demuxer
+            # delay cuts open latency. Timeouts only take effect at open time.
+            with rtsp_capture_options():
+                cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG, [
+                    cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 3000,  # 3 second timeout
+                    cv2.CAP_PROP_READ_TIMEOUT_MSEC, 3000,
+                ])
+            try:
+                if not cap.isOpened():
+                    return False
+                ret, frame = cap.read()
+                return ret and frame is not None
+            finally:
+                cap.release()
+
+        candidates = [(path, rtsp_port) for path in common_paths for rtsp_port in [554, 8554]]  # Try common RTSP ports
+
+        # Probe a few candidates at a time, so the fallback costs a handful
+        # of open timeouts rather than one per URL without flooding the camera
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        try:
+            futures = []
+            for path, rtsp_port in candidates:
                 rtsp_url = f"rtsp://{username}:{password}@{ip}:{rtsp_port}{path}"
                 print(f"[RTSP Fallback] Testing: rtsp://{username}:***@{ip}:{rtsp_port}{path}")
+                futures.append((executor.submit(probe, rtsp_url), path, rtsp_port, rtsp_url))
 
+            # Collect in candidate order, so the best-ranked working URL wins
+            # rather than whichever probe happens to answer first
+            for future, path, rtsp_port, rtsp_url in futures:
                 try:
-                    cap = cv2.VideoCapture(rtsp_url)
-                    cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 3000)  # 3 second timeout
-                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                    if not future.result():
+                        continue
+                except Exception:
+                    continue
 
-                    if cap.isOpened():
-                        ret, frame = cap.read()
-                        cap.release()
-
-                        if ret and frame is not None:
-                            print(f"[RTSP Fallback] Success! Working URL found: {path} on port {rtsp_port}")
-                            return {
-                                'ip': ip,
-                                'port': rtsp_port,
-                                'manufacturer': 'Unknown',
-                                'model': 'Unknown (fallback method)',
-                                'firmware': 'Unknown',
-                                'serial': 'Unknown',
-                                'stream_uris': [rtsp_url],
-                                'profiles': [{
-                                    'name': 'Main Stream',
-                                    'rtsp_url': rtsp_url,
-                                    'complete_url': rtsp_url
-                                }]
-                            }
-                    cap.release()
-                except Exception as e:
-                    pass
+                print(f"[RTSP Fallback] Success! Working URL found: {path} on port {rtsp_port}")
+                return {
+                    'ip': ip,
+                    'port': rtsp_port,
+                    'manufacturer': 'Unknown',
+                    'model': 'Unknown (fallback method)',
+                    'firmware': 'Unknown',
+                    'serial': 'Unknown',
+                    'stream_uris': [rtsp_url],
+                    'profiles': [{
+                        'name': 'Main Stream',
+                        'rtsp_url': rtsp_url,
+                        'complete_url': rtsp_url
+                    }]
+                }
+        finally:
+            # Don't wait for lower-ranked probes once one has succeeded
+            executor.shutdown(wait=False, cancel_futures=True)
 
         # If all attempts failed
         print(f"[RTSP Fallback] All common paths failed for {ip}")
@@ -435,13 +610,11 @@ class ONVIFDiscovery:
 
     def _extract_rtsp_suffix(self, rtsp_url):
         """Extract the suffix/path from full RTSP URL"""
-        import re
-
         # Remove credentials if present
-        url = re.sub(r'rtsp://[^@]+@', 'rtsp://', rtsp_url)
+        url = _CRED_RE.sub('rtsp://', rtsp_url)
 
         # Extract path after IP:PORT
-        match = re.search(r'rtsp://[^/]+/(.+)', url)
+        match = _PATH_RE.search(url)
         if match:
             return match.group(1)
 
@@ -450,12 +623,10 @@ class ONVIFDiscovery:
 
     def _build_rtsp_url(self, ip, username, password, suffix, port=554):
         """Build complete RTSP URL with credentials"""
-        import re
-
         # Handle suffix that might already contain port
         if suffix.startswith('rtsp://'):
             # Extract port if present in suffix
-            port_match = re.search(r':(\d+)/', suffix)
+            port_match = _PORT_RE.search(suffix)
             if port_match:
                 port = int(port_match.group(1))
             # Extract just the path
@@ -480,10 +651,14 @@ class ONVIFDiscovery:
             bool: True if accessible
         """
         import cv2
+        from app.core.vision.rtsp_onvif import rtsp_capture_options
 
         try:
-            cap = cv2.VideoCapture(rtsp_url)
-            cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout * 1000)
+            # Timeouts only take effect when passed at open time
+            with rtsp_capture_options():
+                cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG, [
+                    cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout * 1000,
+                ])
 
             if cap.isOpened():
                 ret, frame = cap.read()
@@ -509,30 +684,22 @@ def scan_network_ports(port=80, subnet='192.168.1', timeout=1):
     Returns:
         list: List of responsive IP addresses
     """
-    responsive_ips = []
-
     def check_port(ip):
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(timeout)
             result = sock.connect_ex((ip, port))
             sock.close()
-            if result == 0:
-                responsive_ips.append(ip)
+            return ip, result == 0
         except:
-            pass
-
-    threads = []
-    for i in range(1, 255):
-        ip = f"{subnet}.{i}"
-        thread = threading.Thread(target=check_port, args=(ip,), daemon=True)
-        thread.start()
-        threads.append(thread)
+            return ip, False
 
-    for thread in threads:
-        thread.join()
+    # A bounded pool instead of a thread (and stack) per address
+    with concurrent.futures.ThreadPoolExecutor(max_workers=64) as executor:
+        futures = [executor.submit(check_port, f"{subnet}.{i}") for i in range(1, 255)]
+        results = [future.result() for future in concurrent.futures.as_completed(futures)]
 
-    return responsive_ips
+    return [ip for ip, is_open in results if is_open]
 
 
 if __name__ == "__main__":
@@ -3,54 +3,129 @@ Model Download Script
 Downloads pre-trained YOLOv8 PPE detection model
 """
 
+import hashlib
+import os
 import sys
+import time
 from pathlib import Path
 from loguru import logger
-import requests
+import httpx
 from tqdm import tqdm
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ultralytics import YOLO
 
+# Connection-pooled client shared by all downloads
+_client = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    limits=httpx.Limits(max_keepalive_connections=4),
+    timeout=httpx.Timeout(30),
+    follow_redirects=True,
+)
 
-def download_file(url: str, destination: Path) -> bool:
-    """
-    Download file with progress bar.
-    
-    Args:
-        url: Download URL
-        destination: Destination file path
-        
-    Returns:
-        True if successful, False otherwise
-    """
-    try:
-        response = requests.get(url, stream=True)
+# Large chunks keep syscall overhead low for 100MB+ model files
+CHUNK_SIZE = 1 << 20
+
+
+def _stream_to_file(url: str, destination: Path):
+    """Stream `url` into `destination`, resuming a partial file if present."""
+    existing = destination.stat().st_size if destination.exists() else 0
+    headers = {'Range': f'bytes={existing}-'} if existing else {}
+
+    with _client.stream("GET", url, headers=headers) as response:
+        # Range starts at the end of the file: nothing left to fetch
+        if existing and response.status_code == 416:
+            return
         response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        
-        with open(destination, 'wb') as f, tqdm(
+
+        # The server may ignore the Range header and send the whole file
+        resumed = response.status_code == 206
+        if not resumed:
+            existing = 0
+
+        total_size = int(response.headers.get('content-length', 0)) + existing
+
+        with open(destination, 'ab' if resumed else 'wb') as f, tqdm(
             desc=destination.name,
             total=total_size,
+            initial=existing,
             unit='B',
             unit_scale=True,
             unit_divisor=1024,
         ) as pbar:
-            for chunk in response.iter_content(chunk_size=8192):
+            for chunk in response.iter_bytes(chunk_size=CHUNK_SIZE):
                 size = f.write(chunk)
                 pbar.update(size)
+
+
+def download_file(url: str, destination: Path, retries: int = 3) -> bool:
+    """
+    Download file with progress bar.
+
+    An interrupted download is resumed with an HTTP Range request; transport
+    errors are retried with exponential backoff.
+    
+    Args:
+        url: Download URL
+        destination: Destination file path
+        retries: Number of retries after a transport error
         
-        return True
-    except Exception as e:
-        logger.error(f"Download failed: {e}")
-        return False
+    Returns:
+        True if successful, False otherwise
+    """
+    for attempt in range(retries + 1):
+        try:
+            _stream_to_file(url, destination)
+            return True
+        except httpx.TransportError as e:
+            if attempt == retries:
+                logger.error(f"Download failed: {e}")
+                return False
+            delay = 2 ** attempt
+            logger.warning(f"Download interrupted ({e}), retrying in {delay}s...")
+            time.sleep(delay)
+        except Exception as e:
+            logger.error(f"Download failed: {e}")
+            return False
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Compute the SHA-256 digest of a file.
+
+    Uses hashlib.file_digest() where available (Python 3.11+), which hashes
+    in C without a Python-level read loop.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
 
 
 def download_default_model():
     """Download default YOLOv8n model."""
+    # Loading through YOLO() would trigger ultralytics' own download check
+    if Path('yolov8n.pt').exists():
+        logger.info("YOLOv8n model already present")
+        return True
+
     logger.info("Downloading default YOLOv8n model...")
     
     try:
@@ -94,16 +169,28 @@ def download_ppe_model():
     return download_default_model()
 
 
-def verify_model(model_path: str = "yolov8n.pt") -> bool:
+def verify_model(model_path: str = "yolov8n.pt", expected_sha256: str = None) -> bool:
     """
     Verify model can be loaded.
+
+    With a pinned digest the file is only hashed, which is much cheaper
+    than loading the weights.
     
     Args:
         model_path: Path to model file
+        expected_sha256: Pinned SHA-256 of the model file, if known
         
     Returns:
-        True if model loads successfully
+        True if model loads successfully (or matches the pinned digest)
     """
+    if expected_sha256 and Path(model_path).exists():
+        digest = file_sha256(Path(model_path))
+        if digest == expected_sha256.lower():
+            logger.info(f"Model verified: {model_path} (sha256 {digest})")
+            return True
+        logger.error(f"Model checksum mismatch for {model_path}: {digest}")
+        return False
+
     try:
         model = YOLO(model_path)
         logger.info(f"Model verified: {model_path}")
@@ -128,7 +215,7 @@ def main():
     
     if success:
         # Verify model
-        if verify_model():
+        if verify_model(expected_sha256=os.getenv("MODEL_SHA256")):
             logger.success("✅ Model setup complete!")
             logger.info("You can now run the application with:")
             logger.info("  streamlit run app/streamlit_app.py")
@@ -16,12 +16,41 @@ sys.path.insert(0, str(project_root))
 import requests
 import threading
 import time
+import asyncio
+import ipaddress
+import socket
+import uuid
+import xml.etree.ElementTree as ET
+from urllib.parse import urlparse
 from typing import Dict, List, Optional
 import getpass
 
 from app.core.vision.rtsp_onvif import ONVIFDiscovery, RTSPCamera
 from loguru import logger
 
+# WS-Discovery multicast group and namespace
+WS_DISCOVERY_ADDR = ("239.255.255.250", 3702)
+WS_DISCOVERY_NS = "http://schemas.xmlsoap.org/ws/2005/04/discovery"
+
+
+async def _probe_all(tasks, timeout: float, active_ips: set, max_concurrent: int = 512):
+    """Probe (ip, port) pairs concurrently, adding responding IPs to `active_ips`."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def probe(ip, port):
+        async with semaphore:
+            # One open port is enough to consider the device active
+            if ip in active_ips:
+                return
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout=timeout)
+            except (OSError, asyncio.TimeoutError):
+                return
+            writer.close()
+            active_ips.add(ip)
+
+    await asyncio.gather(*(probe(ip, port) for ip, port in tasks))
+
 
 def scan_network_connectivity(network_range: str, timeout: float = 1.0) -> List[str]:
     """
@@ -34,45 +63,100 @@ def scan_network_connectivity(network_range: str, timeout: float = 1.0) -> List[
     Returns:
         List of IP addresses that responded
     """
-    active_ips = []
+    active_ips = set()
 
     try:
-        # Parse network range
-        base_ip, subnet = network_range.split('/')
-        subnet = int(subnet)
-
-        # Calculate network range
-        ip_parts = base_ip.split('.')
-        base = (int(ip_parts[0]) << 24) | (int(ip_parts[1]) << 16) | (int(ip_parts[2]) << 8) | int(ip_parts[3])
-        mask = (0xFFFFFFFF << (32 - subnet)) & 0xFFFFFFFF
-        network = base & mask
-        broadcast = network | (~mask & 0xFFFFFFFF)
-
-        # Scan IP range (skip network and broadcast addresses)
-        for ip_int in range(network + 1, broadcast):
-            ip = f"{(ip_int >> 24) & 0xFF}.{(ip_int >> 16) & 0xFF}.{(ip_int >> 8) & 0xFF}.{ip_int & 0xFF}"
-
-            # Try to connect to common camera ports
-            for port in [554, 80, 8080]:  # RTSP, HTTP, HTTP-alt
-                try:
-                    import socket
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(timeout)
-                    result = sock.connect_ex((ip, port))
-                    sock.close()
+        # Hosts in the range (network and broadcast addresses excluded)
+        hosts = [str(ip) for ip in ipaddress.ip_network(network_range, strict=False).hosts()]
 
-                    if result == 0:  # Connection successful
-                        if ip not in active_ips:
-                            active_ips.append(ip)
-                        break  # Found one open port, consider device active
+        # Try to connect to common camera ports
+        tasks = [(ip, port) for ip in hosts for port in (554, 80, 8080)]  # RTSP, HTTP, HTTP-alt
 
-                except Exception:
-                    continue
+        # Connect attempts are pure network waits: run them all on one event
+        # loop rather than a thread each
+        asyncio.run(_probe_all(tasks, timeout, active_ips))
 
     except Exception as e:
         print(f"❌ Network scan error: {str(e)}")
 
-    return active_ips
+    return sorted(active_ips, key=ipaddress.ip_address)
+
+
+def ws_discovery_probe(timeout: float = 3.0) -> List[Dict]:
+    """
+    Find ONVIF devices with a single WS-Discovery multicast probe.
+
+    Every ONVIF device on the LAN answers the probe, so this costs one UDP
+    packet and one timeout window regardless of subnet size.
+
+    Args:
+        timeout: How long to collect responses, in seconds
+
+    Returns:
+        List of discovered camera dictionaries
+    """
+    probe = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" '
+        'xmlns:a="http://schemas.xmlsoap.org/ws/2004/08/addressing">'
+        '<s:Header>'
+        '<a:Action>http://schemas.xmlsoap.org/ws/2005/04/discovery/Probe</a:Action>'
+        f'<a:MessageID>uuid:{uuid.uuid4()}</a:MessageID>'
+        '<a:To>urn:schemas-xmlsoap-org:ws:2005:04:discovery</a:To>'
+        '</s:Header>'
+        '<s:Body>'
+        f'<Probe xmlns="{WS_DISCOVERY_NS}">'
+        f'<d:Types xmlns:d="{WS_DISCOVERY_NS}" '
+        'xmlns:dp0="http://www.onvif.org/ver10/network/wsdl">dp0:NetworkVideoTransmitter</d:Types>'
+        '</Probe>'
+        '</s:Body>'
+        '</s:Envelope>'
+    ).encode('utf-8')
+
+    cameras = {}
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 2)
+        sock.sendto(probe, WS_DISCOVERY_ADDR)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            sock.settimeout(remaining)
+            try:
+                data, (ip, _) = sock.recvfrom(65536)
+            except socket.timeout:
+                break
+
+            if ip in cameras:
+                continue
+            try:
+                xaddrs = ET.fromstring(data).findtext(f'.//{{{WS_DISCOVERY_NS}}}XAddrs')
+            except ET.ParseError:
+                continue
+            if not xaddrs:
+                continue
+
+            url = xaddrs.split()[0]
+            port = urlparse(url).port or 80
+            cameras[ip] = {
+                'ip': ip,
+                'port': port,
+                'url': url,
+                'name': f"ONVIF Camera ({ip}:{port})",
+                'manufacturer': 'Unknown',
+                'model': 'Unknown',
+                'rtsp_url': f"rtsp://{ip}:554/live"
+            }
+
+    except OSError as e:
+        print(f"❌ WS-Discovery probe failed: {str(e)}")
+    finally:
+        sock.close()
+
+    return list(cameras.values())
 
 
 def discover_onvif_cameras_improved(username: str = 'admin', password: str = 'admin') -> List[Dict]:
@@ -151,6 +235,18 @@ def discover_onvif_cameras_basic(network_ranges: List[str] = None) -> List[Dict]
             "172.16.0.0/24",
         ]
 
+    # One multicast probe finds every ONVIF device on the LAN; only sweep the
+    # network ranges when nothing answers (e.g. multicast blocked by the router)
+    print("📡 Sending WS-Discovery multicast probe...")
+    cameras = ws_discovery_probe()
+    if cameras:
+        print(f"✅ Found {len(cameras)} ONVIF camera(s) via WS-Discovery:")
+        for i, cam in enumerate(cameras, 1):
+            print(f"   {i}. {cam['name']} ({cam['ip']})")
+        print()
+        return cameras
+    print("❌ No WS-Discovery replies, falling back to network scan\n")
+
     all_cameras = []
 
     for network_range in network_ranges:
@@ -2,6 +2,7 @@
 Run the FastAPI backend server
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -11,17 +12,38 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import uvicorn
 from loguru import logger
 
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools  # noqa: F401
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
 
 def main():
     """Run the API server."""
     logger.info("Starting SiteGuard AI API Server...")
+
+    # Auto-reload (file watching, single worker) is for development only
+    reload = os.getenv("UVICORN_RELOAD", "0") == "1"
+    workers = 1 if reload else int(os.getenv("API_WORKERS", os.cpu_count() or 1))
     
     uvicorn.run(
         "app.api.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        reload=reload,
+        workers=workers,
+        # C event loop and HTTP parser where available (both ship with uvicorn[standard])
+        loop="uvloop" if UVLOOP_AVAILABLE else "auto",
+        http="httptools" if HTTPTOOLS_AVAILABLE else "auto",
+        log_level="info",
+        access_log=False
     )
 
 
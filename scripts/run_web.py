@@ -4,7 +4,6 @@ Run the Streamlit web application
 
 import sys
 from pathlib import Path
-import subprocess
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -12,18 +11,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 def main():
     """Run the Streamlit app."""
+    # Start the server in this interpreter (as `streamlit run` does) rather
+    # than booting a second Python process through the CLI
+    from streamlit.web import bootstrap
+
     app_path = Path(__file__).parent.parent / "app" / "web" / "streamlit_app.py"
     
     print("Starting SiteGuard AI Web Dashboard...")
     print(f"App path: {app_path}")
     
-    subprocess.run([
-        "streamlit",
-        "run",
-        str(app_path),
-        "--server.port=8501",
-        "--server.address=localhost"
-    ])
+    flag_options = {
+        "server_port": 8501,
+        "server_address": "localhost"
+    }
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(str(app_path), False, [], flag_options)
 
 
 if __name__ == "__main__":
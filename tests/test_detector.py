@@ -175,6 +175,14 @@ class TestPPEDetector:
         assert updated_metrics["total_inferences"] == 1
         assert updated_metrics["total_inference_time"] > 0
     
+    def test_warmup_leaves_metrics_untouched(self, detector):
+        """Test that warmup does not count as an inference."""
+        detector.warmup()
+        
+        metrics = detector.get_metrics()
+        assert metrics["total_inferences"] == 0
+        assert metrics["violations_detected"] == 0
+    
     def test_reset_metrics(self, detector, sample_image):
         """Test metrics reset."""
         detector.detect(sample_image)
@@ -201,6 +209,31 @@ class TestBatchProcessing:
         
         assert len(results) == 3
         assert all(isinstance(r, DetectionResult) for r in results)
+    
+    def test_batch_detect_failed_chunk_placeholders(self, detector, tmp_path, monkeypatch):
+        """Test that a failed chunk yields placeholders and order is kept."""
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"frame_{i}.jpg"
+            cv2.imwrite(str(path), np.full((64, 64, 3), i * 40, dtype=np.uint8))
+            paths.append(str(path))
+        
+        calls = []
+        
+        def fake_predict(images, **kwargs):
+            calls.append(len(images))
+            if len(calls) == 2:
+                raise RuntimeError("forward pass failed")
+            return [None] * len(images)
+        
+        monkeypatch.setattr(detector.model, "predict", fake_predict)
+        
+        results = detector.detect_batch(paths, batch_size=2, annotate=False)
+        
+        # One forward pass per chunk: [0, 1], [2, 3] (fails), [4]
+        assert calls == [2, 2, 1]
+        assert [r.image_path for r in results] == [paths[0], paths[1], "", "", paths[4]]
+        assert all(r.detections == [] for r in results[2:4])
 
 
 @pytest.mark.parametrize("confidence,expected_min", [
@@ -8,6 +8,7 @@ from app.core.llm.generator import (
     ReportGenerator,
     ReportMetadata,
     ReportFormat,
+    IncidentReport,
     OpenAIProvider,
     GeminiProvider,
     create_report_generator
@@ -78,5 +79,27 @@ def test_violation_formatting():
     assert violations[0]["severity"] == "high"
 
 
+def test_report_dict_repr_cached_and_invalidated():
+    """Test that dict_repr is memoized until explicitly invalidated."""
+    report = IncidentReport(
+        report_id="RPT-20240101000000",
+        title="Test Report",
+        text="Report body",
+        metadata=ReportMetadata(location="Test Site", timestamp=datetime.now()),
+        violations=[],
+        recommendations=[],
+        format=ReportFormat.FORMAL,
+        generated_at=datetime.now()
+    )
+    
+    first = report.dict_repr
+    assert first == report.to_dict()
+    assert report.dict_repr is first
+    
+    report.metadata.worker_name = "Ali"
+    report.invalidate_dict_repr()
+    assert report.dict_repr["metadata"]["worker_name"] == "Ali"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
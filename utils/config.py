@@ -4,9 +4,10 @@ Configuration management utilities
 
 import os
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 from loguru import logger
 
 
@@ -40,19 +41,35 @@ class Config:
         return self._config.copy()
 
 
+@lru_cache(maxsize=8)
+def _parse_env_file(env_path: str, mtime_ns: int) -> Dict[str, Optional[str]]:
+    """Parse a .env file once per path and modification time."""
+    values = dotenv_values(env_path)
+    logger.info(f"Loaded environment from {env_path}")
+    return values
+
+
 def load_env(env_file: str = ".env") -> None:
     """
     Load environment variables from .env file.
+
+    The file is only re-parsed when it changes, so repeated calls (e.g. from
+    load_config() on every app rerun) are cheap. As with load_dotenv(),
+    variables already set in the environment are not overridden.
     
     Args:
         env_file: Path to .env file
     """
     env_path = Path(env_file)
-    if env_path.exists():
-        load_dotenv(env_path)
-        logger.info(f"Loaded environment from {env_file}")
-    else:
+    try:
+        mtime_ns = env_path.stat().st_mtime_ns
+    except OSError:
         logger.warning(f"Environment file {env_file} not found")
+        return
+
+    for key, value in _parse_env_file(str(env_path.resolve()), mtime_ns).items():
+        if value is not None:
+            os.environ.setdefault(key, value)
 
 
 def load_yaml_config(config_path: str) -> Dict[str, Any]:
@@ -133,6 +150,7 @@ def get_detector_config() -> Dict[str, Any]:
         "confidence_threshold": float(os.getenv("CONFIDENCE_THRESHOLD", "0.5")),
         "iou_threshold": float(os.getenv("IOU_THRESHOLD", "0.45")),
         "device": os.getenv("DEVICE", None),
+        "model_backend": os.getenv("MODEL_BACKEND", "pytorch"),
         "verbose": os.getenv("VERBOSE", "false").lower() == "true"
     }
 